@@ -0,0 +1,289 @@
+import numpy as np
+import pandas as pd
+from quantile_sketch import (QuantileSketch, DEFAULT_RELATIVE_ACCURACY, period_sketches, merge_sketches,
+                            period_bucket_counts, bucket_quantiles)
+
+
+def _grouped_mean(values, period, index):
+    """Per-period mean of the non-null values, 0 for periods without any.
+
+    Values are stably sorted by period once and each contiguous run is summed
+    with numpy's pairwise reduction, so every mean matches Series.mean() on the
+    same subset bit for bit (groupby().mean() uses compensated summation and
+    can differ in the last digit).
+    """
+    valid = (values.notna() & period.notna()).to_numpy()
+    codes = index.get_indexer(period[valid])
+    order = np.argsort(codes, kind='stable')
+    sorted_values = values.to_numpy(dtype=float)[valid][order]
+    counts = np.bincount(codes, minlength=len(index))
+    return pd.Series(segment_means(sorted_values, counts), index=index)
+
+
+def segment_means(sorted_values, counts):
+    """Mean of each contiguous run of ``counts[i]`` values (0 for empty runs), pairwise-summed"""
+    ends = np.cumsum(counts)
+    starts = ends - counts
+    sums = np.array([sorted_values[start:end].sum() for start, end in zip(starts, ends)], dtype=float)
+    return np.divide(sums, counts, out=np.zeros(len(counts)), where=counts > 0)
+
+
+SKETCH_COLUMN = 'deployment_days_sketch'
+
+
+def deployment_period_stats(df, freq='M', key='year_month', sketch_accuracy=None):
+    """Compute every per-period deployment metric in a single grouped pass.
+
+    The boolean filters used by the dashboard and the cost calculator are
+    evaluated once as mask columns, then aggregated with named agg/quantile
+    calls instead of a Python callback per group. Returns one row per period
+    (sorted, keyed by ``key``) with pipeline counts, completion/failure rates,
+    avg/median/p90 deployment days, auto-trigger percentage and the first
+    branch creation timestamp of the period.
+
+    With ``sketch_accuracy`` (e.g. 0.01 for 1%) median/p90 come from a
+    mergeable QuantileSketch per period instead of the exact values; the
+    sketches are returned in the ``deployment_days_sketch`` column so coarser
+    periods can be derived with rollup_period_stats().
+    """
+    period = df['branch_creation_datetime'].dt.to_period(freq).rename(key)
+    days = df['days_elapsed_branch_to_deploy']
+
+    # Precomputed masks shared by all metrics
+    masks = pd.DataFrame({
+        'completed': df['deploy_prod_job_end_datetime'].notna(),
+        'deployed': days > 0,
+        'auto': df['deploy_prod_job_trigger'] == 'auto'
+    })
+    deployed_days = days.where(masks['deployed'])
+
+    stats = masks.groupby(period).agg(
+        total_pipelines=('completed', 'size'),
+        completed_pipelines=('completed', 'sum'),
+        deployed_pipelines=('deployed', 'sum'),
+        auto_pipelines=('auto', 'sum')
+    )
+
+    # Deployment time distribution (only deployments with >0 days, 0 when a period has none)
+    days_grouped = deployed_days.groupby(period)
+    stats['avg_deployment_days'] = _grouped_mean(deployed_days, period, stats.index)
+    if sketch_accuracy is None:
+        stats['median_deployment_days'] = days_grouped.median().fillna(0)
+        stats['p90_deployment_days'] = days_grouped.quantile(0.9).fillna(0)
+    else:
+        sketches = period_sketches(deployed_days, period, sketch_accuracy)
+        stats[SKETCH_COLUMN] = pd.Series(
+            [sketches.get(p, QuantileSketch(sketch_accuracy)) for p in stats.index], index=stats.index, dtype=object)
+        sketch_quantiles(stats)
+
+    stats['completion_rate'] = stats['completed_pipelines'] / stats['total_pipelines'] * 100
+    stats['failure_rate'] = 1 - (stats['completed_pipelines'] / stats['total_pipelines'])
+    stats['auto_percentage'] = stats['auto_pipelines'] / stats['total_pipelines'] * 100
+    stats['first_branch_creation'] = df['branch_creation_datetime'].groupby(period).first()
+
+    return stats.reset_index()
+
+
+def sketch_quantiles(stats):
+    """Fill median/p90 from the sketch column (0 for periods without deployments)"""
+    sketches = stats[SKETCH_COLUMN]
+    stats['median_deployment_days'] = [sketch.quantile(0.5) if sketch.count else 0 for sketch in sketches]
+    stats['p90_deployment_days'] = [sketch.quantile(0.9) if sketch.count else 0 for sketch in sketches]
+
+
+def rollup_period_stats(stats, groups, key='year_month'):
+    """Combine per-period stats into coarser groups without rescanning rows.
+
+    ``groups`` is either a coarser pandas frequency ('Q', 'Y') applied to the
+    ``key`` period column, or labels aligned with ``stats`` (e.g. 'before' /
+    'after' auto-deploy). Counts are summed, averages re-weighted by deployed
+    pipelines and median/p90 taken from the merged sketches, so ``stats`` must
+    carry the deployment_days_sketch column for those two (NaN otherwise).
+    """
+    if isinstance(groups, str):
+        labels = stats[key].dt.asfreq(groups).rename(key)
+    else:
+        labels = pd.Series(np.asarray(groups), index=stats.index, name=key)
+
+    counts = ['total_pipelines', 'completed_pipelines', 'deployed_pipelines', 'auto_pipelines']
+    weighted = stats[counts].assign(
+        deployed_days_sum=stats['avg_deployment_days'] * stats['deployed_pipelines'])
+    grouped = weighted.groupby(labels, sort=True)
+    rolled = grouped.sum()[counts]
+    deployed_days_sum = grouped['deployed_days_sum'].sum()
+    rolled['avg_deployment_days'] = (deployed_days_sum / rolled['deployed_pipelines']).where(
+        rolled['deployed_pipelines'] > 0, 0.0)
+
+    if SKETCH_COLUMN in stats:
+        rolled[SKETCH_COLUMN] = [
+            merge_sketches(group, group.iloc[0].relative_accuracy)
+            for _, group in stats[SKETCH_COLUMN].groupby(labels, sort=True)
+        ]
+        sketch_quantiles(rolled)
+    else:
+        rolled['median_deployment_days'] = np.nan
+        rolled['p90_deployment_days'] = np.nan
+
+    rolled['completion_rate'] = rolled['completed_pipelines'] / rolled['total_pipelines'] * 100
+    rolled['failure_rate'] = 1 - (rolled['completed_pipelines'] / rolled['total_pipelines'])
+    rolled['auto_percentage'] = rolled['auto_pipelines'] / rolled['total_pipelines'] * 100
+    rolled['first_branch_creation'] = stats['first_branch_creation'].groupby(labels, sort=True).first()
+    return rolled.reset_index()
+
+
+ROLLUP_FREQS = ('D', 'W', 'M', 'Q')
+COUNT_COLUMNS = ['total_pipelines', 'completed_pipelines', 'deployed_pipelines', 'auto_pipelines']
+
+
+def rollup_period_totals(base, buckets, freq, key='period', relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+    """Stats of ``freq`` periods from the totals of finer periods.
+
+    ``base`` is indexed by the finer periods and holds their pipeline counts,
+    ``deployed_days_sum`` and ``first_branch_creation``; ``buckets`` holds
+    their lead time sketch bucket counts, indexed by (period, bucket key).
+    Returns the deployment_period_stats() columns, keyed by ``key``.
+    """
+    labels = base.index.asfreq(freq).rename(key)
+    grouped = base.groupby(labels, sort=True)
+    stats = grouped[COUNT_COLUMNS].sum()
+    deployed = stats['deployed_pipelines']
+    stats['avg_deployment_days'] = (grouped['deployed_days_sum'].sum() / deployed).where(deployed > 0, 0.0)
+
+    # Sketches of the coarser periods are the summed bucket counts of their finest periods
+    if len(buckets):
+        buckets = buckets.groupby([buckets.index.get_level_values(0).asfreq(freq),
+                                   buckets.index.get_level_values(1)]).sum()
+        for column, q in (('median_deployment_days', 0.5), ('p90_deployment_days', 0.9)):
+            stats[column] = bucket_quantiles(buckets, q, relative_accuracy).reindex(stats.index, fill_value=0.0)
+    else:
+        stats['median_deployment_days'] = 0.0
+        stats['p90_deployment_days'] = 0.0
+
+    stats['completion_rate'] = stats['completed_pipelines'] / stats['total_pipelines'] * 100
+    stats['failure_rate'] = 1 - (stats['completed_pipelines'] / stats['total_pipelines'])
+    stats['auto_percentage'] = stats['auto_pipelines'] / stats['total_pipelines'] * 100
+    stats['first_branch_creation'] = grouped['first_branch_creation'].first()
+    return stats.reset_index()
+
+
+def period_rollups(df, freqs=ROLLUP_FREQS, key='period', relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+    """Deployment stats at several granularities from a single pass over the rows.
+
+    The rows are aggregated once at the finest frequency (``freqs[0]``):
+    pipeline counts, deployed-days sums, first branch creation and quantile
+    sketch bucket counts per period, all in flat columns. Every frequency is
+    then a groupby-sum of those finest periods (a few thousand rows), never a
+    rescan. Returns {freq: stats} with the deployment_period_stats() columns;
+    averages are exact up to summation order, median/p90 within
+    ``relative_accuracy``. Coarser periods must be unions of the finest ones
+    (days roll up into weeks, months and quarters; weeks only into weeks).
+    """
+    finest = freqs[0]
+    if finest.startswith('W') and any(not freq.startswith('W') for freq in freqs[1:]):
+        raise ValueError("Weeks straddle months and quarters, roll up from days ('D') instead")
+
+    period = df['branch_creation_datetime'].dt.to_period(finest).rename(key)
+    days = df['days_elapsed_branch_to_deploy']
+    masks = pd.DataFrame({
+        'completed': df['deploy_prod_job_end_datetime'].notna(),
+        'deployed': days > 0,
+        'auto': df['deploy_prod_job_trigger'] == 'auto'
+    })
+    deployed_days = days.where(masks['deployed'])
+
+    base = masks.groupby(period).agg(
+        total_pipelines=('completed', 'size'),
+        completed_pipelines=('completed', 'sum'),
+        deployed_pipelines=('deployed', 'sum'),
+        auto_pipelines=('auto', 'sum')
+    )
+    base['deployed_days_sum'] = deployed_days.groupby(period).sum()
+    base['first_branch_creation'] = df['branch_creation_datetime'].groupby(period).first()
+    buckets = period_bucket_counts(deployed_days, period, relative_accuracy)
+
+    return {freq: rollup_period_totals(base, buckets, freq, key, relative_accuracy) for freq in freqs}
+
+
+def split_stats(df, split_date):
+    """Pipeline totals before and after a split date.
+
+    Returns {'before': {...}, 'after': {...}} with total, completed and
+    deployed (>0 days) pipeline counts and the average deployment days.
+    """
+    created = df['branch_creation_datetime']
+    result = {}
+    for name, rows in (('before', created < split_date), ('after', created >= split_date)):
+        segment = df[rows]
+        deployed_days = segment.loc[segment['days_elapsed_branch_to_deploy'] > 0, 'days_elapsed_branch_to_deploy']
+        result[name] = {
+            'total_pipelines': len(segment),
+            'completed_pipelines': int(segment['deploy_prod_job_end_datetime'].notna().sum()),
+            'deployed_pipelines': len(deployed_days),
+            'avg_deployment_days': deployed_days.mean() if len(deployed_days) > 0 else 0
+        }
+    return result
+
+
+def event_split_stats(df, event_dates, window=None):
+    """split_stats() around each of several event dates, from one sort of the rows.
+
+    The branch creation times are sorted once (skipped when the export is
+    already in order) and every event boundary or window edge becomes a
+    searchsorted() position, so each side of an event is a contiguous run:
+    counts are differences of cumulative sums and the deployed days are one
+    slice, instead of a boolean mask over every row per event. ``window``
+    (a Timedelta) limits both sides to that long before/after the event,
+    None compares the whole history. Returns one split_stats() dict per date.
+    """
+    created = df['branch_creation_datetime'].to_numpy(dtype='datetime64[ns]')
+    days = df['days_elapsed_branch_to_deploy'].to_numpy(dtype=float, na_value=np.nan)
+    completed = df['deploy_prod_job_end_datetime'].notna().to_numpy()
+    valid = ~np.isnat(created)
+    created, days, completed = created[valid], days[valid], completed[valid]
+    if (created[1:] < created[:-1]).any():
+        order = np.argsort(created, kind='stable')
+        created, days, completed = created[order], days[order], completed[order]
+
+    deployed = days > 0
+    completed_before = np.concatenate(([0], np.cumsum(completed)))
+    deployed_before = np.concatenate(([0], np.cumsum(deployed)))
+    deployed_days = days[deployed]
+
+    def side(start, end):
+        first, last = deployed_before[start], deployed_before[end]
+        count = int(last - first)
+        return {
+            'total_pipelines': int(end - start),
+            'completed_pipelines': int(completed_before[end] - completed_before[start]),
+            'deployed_pipelines': count,
+            'avg_deployment_days': deployed_days[first:last].sum() / count if count > 0 else 0
+        }
+
+    dates = np.array([pd.Timestamp(date).tz_convert(None) if pd.Timestamp(date).tz else pd.Timestamp(date)
+                      for date in event_dates], dtype='datetime64[ns]')
+    boundaries = np.searchsorted(created, dates)
+    if window is None:
+        starts, ends = np.zeros_like(boundaries), np.full_like(boundaries, len(created))
+    else:
+        window = pd.Timedelta(window).to_timedelta64()
+        starts, ends = np.searchsorted(created, dates - window), np.searchsorted(created, dates + window)
+    return [{'before': side(start, boundary), 'after': side(boundary, end)}
+            for start, boundary, end in zip(starts, boundaries, ends)]
+
+
+AGGREGATION_BACKENDS = ('pandas', 'arrow')
+
+
+def aggregation_backend(name='pandas'):
+    """(period_stats, split_stats) functions of the named backend.
+
+    'pandas' is the default in-process engine above; 'arrow' runs the row-level
+    work on multi-threaded pyarrow.compute kernels (see arrow_aggregation.py).
+    Both take and return the same shapes and produce identical values.
+    """
+    if name == 'pandas':
+        return deployment_period_stats, split_stats
+    if name == 'arrow':
+        from arrow_aggregation import arrow_period_stats, arrow_split_stats
+        return arrow_period_stats, arrow_split_stats
+    raise ValueError(f"Unknown aggregation backend '{name}', expected one of {AGGREGATION_BACKENDS}")
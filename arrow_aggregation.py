@@ -0,0 +1,140 @@
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+from aggregation import SKETCH_COLUMN, segment_means, sketch_quantiles
+from quantile_sketch import QuantileSketch, period_sketches
+
+# Row-level aggregation on pyarrow.compute kernels and Acero's multi-threaded
+# hash aggregation. Only per-period results (a few hundred rows) come back to
+# pandas, and every value is computed the way the pandas backend computes it,
+# so both backends produce the same numbers bit for bit.
+
+
+def _column(df, name):
+    """A DataFrame column as an arrow array (NaN -> null, categories decoded)"""
+    array = pa.array(df[name], from_pandas=True)
+    if pa.types.is_dictionary(array.type):
+        array = array.dictionary_decode()
+    return array
+
+
+def _period_ordinals(created, freq):
+    """pandas Period ordinals of each timestamp (null where the timestamp is missing)"""
+    # Periods follow the wall clock of the timestamps' zone, like Series.dt.to_period()
+    if created.type.tz in ('UTC', '+00:00'):
+        created = created.cast(pa.timestamp(created.type.unit))
+    elif created.type.tz is not None:
+        created = pc.local_timestamp(created)
+    if freq == 'M':
+        return pc.add(pc.multiply(pc.subtract(pc.year(created), 1970), 12), pc.subtract(pc.month(created), 1))
+    if freq == 'Q':
+        return pc.add(pc.multiply(pc.subtract(pc.year(created), 1970), 4), pc.subtract(pc.quarter(created), 1))
+    if freq == 'Y':
+        return pc.subtract(pc.year(created), 1970)
+    if freq == 'D':
+        return created.cast(pa.date32()).cast(pa.int32()).cast(pa.int64())
+    # Other frequencies (weeks anchored on a weekday, ...) use pandas' own period arithmetic
+    periods = pd.Series(created.to_pandas()).dt.to_period(freq)
+    return pa.array(periods.array.asi8, mask=periods.isna().to_numpy())
+
+
+def _segment_median_and_quantile(values, counts, q):
+    """Median and linear-interpolated q-quantile of each contiguous run, 0 for empty runs.
+
+    Only the order statistics needed are selected (np.partition, linear time)
+    and combined the way pandas' groupby().median()/quantile() combine them.
+    """
+    medians, quantiles = np.zeros(len(counts)), np.zeros(len(counts))
+    start = 0
+    for i, n in enumerate(counts.tolist()):
+        if n == 0:
+            continue
+        position = q * (n - 1)
+        offset = int(position)
+        fraction = position % 1
+        middle = ((n - 1) // 2, n // 2)
+        selected = np.partition(values[start:start + n], sorted({*middle, offset, min(offset + 1, n - 1)}))
+        medians[i] = (selected[middle[0]] + selected[middle[1]]) / 2
+        low = selected[offset]
+        quantiles[i] = low if fraction == 0 else low + (selected[offset + 1] - low) * fraction
+        start += n
+    return medians, quantiles
+
+
+def arrow_period_stats(df, freq='M', key='year_month', sketch_accuracy=None):
+    """deployment_period_stats() computed with pyarrow.compute.
+
+    Masks, period keys and the per-period counts run as arrow kernels and a
+    hash aggregation; the deployed days are then stably sorted by period, so
+    each period's mean (pairwise-summed in row order) and median/p90 (order
+    statistics selected in linear time) are read off one contiguous run.
+    """
+    created = _column(df, 'branch_creation_datetime')
+    days = _column(df, 'days_elapsed_branch_to_deploy')
+    period = _period_ordinals(created, freq)
+    table = pa.table({
+        'period': period,
+        'row': pa.array(np.arange(len(df), dtype=np.int64)),
+        'days': days,
+        'completed': pc.is_valid(_column(df, 'deploy_prod_job_end_datetime')),
+        'deployed': pc.fill_null(pc.greater(days, 0), False),
+        'auto': pc.fill_null(pc.equal(_column(df, 'deploy_prod_job_trigger').cast(pa.string()), 'auto'), False)
+    }).filter(pc.is_valid(period))
+
+    grouped = table.group_by('period').aggregate([
+        ('row', 'count'), ('completed', 'sum'), ('deployed', 'sum'), ('auto', 'sum'), ('row', 'min')
+    ]).sort_by('period')
+    ordinals = grouped['period'].to_numpy()
+    deployed_counts = grouped['deployed_sum'].to_numpy().astype(np.int64)
+
+    stats = pd.DataFrame({
+        'total_pipelines': grouped['row_count'].to_numpy().astype(np.int64),
+        'completed_pipelines': grouped['completed_sum'].to_numpy().astype(np.int64),
+        'deployed_pipelines': deployed_counts,
+        'auto_pipelines': grouped['auto_sum'].to_numpy().astype(np.int64)
+    }, index=pd.PeriodIndex.from_ordinals(ordinals, freq=freq).rename(key))
+
+    # Deployment time distribution (only deployments with >0 days, 0 when a period has none)
+    deployed = table.filter(table['deployed']).select(['period', 'days'])
+    in_row_order = deployed.take(pc.sort_indices(deployed, sort_keys=[('period', 'ascending')]))
+    deployed_days = in_row_order['days'].to_numpy()
+    stats['avg_deployment_days'] = segment_means(deployed_days, deployed_counts)
+    if sketch_accuracy is None:
+        stats['median_deployment_days'], stats['p90_deployment_days'] = _segment_median_and_quantile(
+            deployed_days, deployed_counts, 0.9)
+    else:
+        deployed_days = pd.Series(deployed_days)
+        deployed_periods = pd.Series(pd.PeriodIndex.from_ordinals(in_row_order['period'].to_numpy(), freq=freq))
+        sketches = period_sketches(deployed_days, deployed_periods, sketch_accuracy)
+        stats[SKETCH_COLUMN] = pd.Series(
+            [sketches.get(p, QuantileSketch(sketch_accuracy)) for p in stats.index], index=stats.index, dtype=object)
+        sketch_quantiles(stats)
+
+    stats['completion_rate'] = stats['completed_pipelines'] / stats['total_pipelines'] * 100
+    stats['failure_rate'] = 1 - (stats['completed_pipelines'] / stats['total_pipelines'])
+    stats['auto_percentage'] = stats['auto_pipelines'] / stats['total_pipelines'] * 100
+    first_rows = grouped['row_min'].to_numpy()
+    stats['first_branch_creation'] = df['branch_creation_datetime'].array.take(first_rows)
+
+    return stats.reset_index()
+
+
+def arrow_split_stats(df, split_date):
+    """split_stats() computed with pyarrow.compute"""
+    created = _column(df, 'branch_creation_datetime')
+    boundary = pa.scalar(pd.Timestamp(split_date).as_unit(created.type.unit), type=created.type)
+    days = _column(df, 'days_elapsed_branch_to_deploy')
+    completed = pc.is_valid(_column(df, 'deploy_prod_job_end_datetime'))
+    result = {}
+    for name, rows in (('before', pc.less(created, boundary)), ('after', pc.greater_equal(created, boundary))):
+        segment_days = days.filter(rows)
+        # Kept in row order so the pairwise sum matches Series.mean()
+        deployed_days = segment_days.filter(pc.fill_null(pc.greater(segment_days, 0), False)).to_numpy()
+        result[name] = {
+            'total_pipelines': len(segment_days),
+            'completed_pipelines': int(pc.sum(completed.filter(rows)).as_py() or 0),
+            'deployed_pipelines': len(deployed_days),
+            'avg_deployment_days': deployed_days.sum() / len(deployed_days) if len(deployed_days) > 0 else 0
+        }
+    return result
@@ -0,0 +1,128 @@
+import os
+import sys
+import json
+import time
+import argparse
+import traceback
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+DASHBOARD_FILENAME = 'autodeploy_impact_dashboard.html'
+STATIC_CHARTS_DIRNAME = 'static_charts'
+
+
+def generate_tenant_report(data_dir, use_cache=True, static_charts=False):
+    """Load, aggregate and render one tenant's dashboard (runs in a worker process)"""
+    # Imported here so the parent process never pays for pandas
+    from data_loader import ReportData
+    from cache import ColumnarCache
+    from create_devops_impact_report import create_autodeploy_dashboard, create_static_charts
+
+    started = time.perf_counter()
+    output_path = os.path.join(data_dir, DASHBOARD_FILENAME)
+    result = {'tenant': data_dir, 'output': output_path}
+    try:
+        data = ReportData(data_dir)
+        if not use_cache:
+            data.cache = ColumnarCache(enabled=False)
+        dashboard_data = create_autodeploy_dashboard(data, output_path=output_path)
+        if static_charts:
+            create_static_charts(dashboard_data, os.path.join(data_dir, STATIC_CHARTS_DIRNAME))
+        result['status'] = 'ok'
+    except Exception as e:
+        result['status'] = 'failed'
+        result['error'] = f"{type(e).__name__}: {e}"
+        result['traceback'] = traceback.format_exc()
+    result['seconds'] = round(time.perf_counter() - started, 3)
+    return result
+
+
+def _worker_failure(tenant_dir, error):
+    """Result of a tenant whose worker process itself died (e.g. killed for memory)"""
+    return {
+        'tenant': tenant_dir,
+        'status': 'failed',
+        'error': f"{type(error).__name__}: {error}",
+        'seconds': None
+    }
+
+
+def _generate_isolated(tenant_dir, use_cache, static_charts):
+    """Generate one tenant in a process of its own, so a crash can only fail this tenant"""
+    with ProcessPoolExecutor(max_workers=1) as pool:
+        try:
+            return pool.submit(generate_tenant_report, tenant_dir, use_cache, static_charts).result()
+        except Exception as e:
+            return _worker_failure(tenant_dir, e)
+
+
+def generate_reports(tenant_dirs, max_workers=None, use_cache=True, static_charts=False):
+    """Generate one dashboard per tenant data directory in a bounded process pool.
+
+    Each tenant succeeds or fails on its own. A worker that dies breaks the
+    shared pool and every pending tenant with it, so the tenants left
+    unfinished are then rerun each in its own process and only the one that
+    crashed is reported as failed. Returns per-tenant results (status,
+    seconds, error) in the order the tenants were given.
+    """
+    results = {}
+    unfinished = []
+    with ProcessPoolExecutor(max_workers=max_workers) as pool:
+        futures = {
+            pool.submit(generate_tenant_report, tenant_dir, use_cache, static_charts): tenant_dir
+            for tenant_dir in tenant_dirs
+        }
+        for future in as_completed(futures):
+            tenant_dir = futures[future]
+            try:
+                results[tenant_dir] = future.result()
+            except BrokenProcessPool:
+                unfinished.append(tenant_dir)
+            except Exception as e:
+                results[tenant_dir] = _worker_failure(tenant_dir, e)
+    if unfinished:
+        with ThreadPoolExecutor(max_workers=max_workers or os.cpu_count()) as threads:
+            for tenant_dir, result in zip(unfinished, threads.map(
+                    lambda tenant_dir: _generate_isolated(tenant_dir, use_cache, static_charts), unfinished)):
+                results[tenant_dir] = result
+    return [results[tenant_dir] for tenant_dir in tenant_dirs]
+
+
+def print_summary(results, wall_seconds):
+    """Print per-tenant status and timings"""
+    print()
+    print("📋 BATCH SUMMARY")
+    print("=" * 60)
+    for result in results:
+        icon = "✅" if result['status'] == 'ok' else "❌"
+        seconds = f"{result['seconds']:.2f}s" if result['seconds'] is not None else "-"
+        print(f"{icon} {result['tenant']:<40} {seconds:>10}")
+        if result['status'] != 'ok':
+            print(f"   {result['error']}")
+    failed = sum(1 for result in results if result['status'] != 'ok')
+    print(f"   {len(results) - failed}/{len(results)} tenants succeeded in {wall_seconds:.2f}s")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate the auto-deploy impact dashboard for several tenants")
+    parser.add_argument('tenant_dirs', nargs='+', help="Tenant data directories (one dashboard is written in each)")
+    parser.add_argument('--workers', type=int, default=None,
+                        help="Maximum number of tenants processed at once (default: CPU count)")
+    parser.add_argument('--no-cache', action='store_true',
+                        help="Read the CSV inputs directly, bypassing the columnar cache")
+    parser.add_argument('--static-charts', action='store_true',
+                        help=f"Also render SVG charts and a no-JS report in each tenant's {STATIC_CHARTS_DIRNAME}/")
+    parser.add_argument('--summary', help="Write the per-tenant results as JSON to this path")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    started = time.perf_counter()
+    results = generate_reports(args.tenant_dirs, args.workers, not args.no_cache, args.static_charts)
+    wall_seconds = time.perf_counter() - started
+    print_summary(results, wall_seconds)
+    if args.summary:
+        with open(args.summary, 'w') as f:
+            json.dump({'wall_seconds': round(wall_seconds, 3), 'tenants': results}, f, indent=4)
+    sys.exit(1 if any(result['status'] != 'ok' for result in results) else 0)
@@ -0,0 +1,169 @@
+import os
+import sys
+import json
+import argparse
+import platform
+import statistics
+import subprocess
+from datetime import datetime
+from synthetic_data import generate_dataset, parse_count
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'create_devops_impact_report.py')
+BENCHMARK_DIR = '.benchmarks'
+DEFAULT_SIZES = ['10k:3', '100k:5', '1M:10']
+DEFAULT_BASELINE = 'benchmark_baseline.json'
+# Stage timings below this many seconds are too noisy to flag
+MIN_SECONDS = 0.05
+
+
+def parse_size(text):
+    """'1M:10' -> (1000000, 10): pipeline rows and years of history"""
+    rows, _, years = text.partition(':')
+    return parse_count(rows), int(years or 3)
+
+
+def dataset_dir(rows, years, seed=0):
+    """Synthetic inputs for one size, generated once and reused across runs"""
+    path = os.path.join(BENCHMARK_DIR, 'data', f'{rows}_{years}y_seed{seed}')
+    marker = os.path.join(path, '.complete')
+    if not os.path.exists(marker):
+        print(f"🧪 Generating {rows:,} pipelines over {years} years in '{path}'...")
+        generate_dataset(path, rows, years, seed)
+        open(marker, 'w').close()
+    return path
+
+
+def stage_timings(records):
+    """Profile records keyed by their stage path, e.g. 'dashboard run / build dashboard data'"""
+    timings, path = {}, []
+    for record in records:
+        path = path[:record['depth']] + [record['stage']]
+        timings[' / '.join(path)] = {
+            'wall_seconds': record['wall_seconds'],
+            'cpu_seconds': record['cpu_seconds'],
+            'peak_rss_mb': record['peak_rss_mb'],
+            'rows': record['rows']
+        }
+    return timings
+
+
+def profile_run(data_dir):
+    """One cold dashboard run in a fresh process (so peak RSS is its own), returns its stage timings"""
+    profile_path = os.path.abspath(os.path.join(data_dir, 'benchmark_profile.json'))
+    subprocess.run([sys.executable, SCRIPT, '--force', '--no-cache', '--profile', profile_path],
+                   cwd=data_dir, check=True, capture_output=True)
+    with open(profile_path, 'r') as f:
+        return stage_timings(json.load(f)['stages'])
+
+
+def benchmark_size(data_dir, repeat):
+    """Median wall/CPU time and worst peak RSS of each stage over `repeat` runs"""
+    runs = [profile_run(data_dir) for _ in range(repeat)]
+    result = {}
+    for key in runs[0]:
+        samples = [run[key] for run in runs if key in run]
+        rss = [sample['peak_rss_mb'] for sample in samples if sample['peak_rss_mb'] is not None]
+        result[key] = {
+            'wall_seconds': statistics.median(sample['wall_seconds'] for sample in samples),
+            'cpu_seconds': statistics.median(sample['cpu_seconds'] for sample in samples),
+            'peak_rss_mb': max(rss) if rss else None,
+            'rows': samples[0]['rows']
+        }
+    return result
+
+
+def run_benchmarks(sizes, repeat=3, seed=0):
+    """Stage timings per size label"""
+    results = {}
+    for size in sizes:
+        rows, years = parse_size(size)
+        print(f"⏱️  Benchmarking {size} ({rows:,} pipelines, {years} years, {repeat} runs)...")
+        results[size] = benchmark_size(dataset_dir(rows, years, seed), repeat)
+    return results
+
+
+def find_regressions(results, baseline, tolerance=0.25, min_seconds=MIN_SECONDS):
+    """Stages slower (or runs hungrier) than the baseline by more than `tolerance`"""
+    regressions = []
+    for size, stages in results.items():
+        for key, current in stages.items():
+            previous = baseline.get(size, {}).get(key)
+            if previous is None:
+                continue
+            if (current['wall_seconds'] >= min_seconds
+                    and current['wall_seconds'] > previous['wall_seconds'] * (1 + tolerance)):
+                regressions.append((size, key, 'wall_seconds', previous['wall_seconds'], current['wall_seconds']))
+            # Peak memory is process-wide, so only the outermost stage is compared
+            if (key == 'dashboard run' and current['peak_rss_mb'] and previous['peak_rss_mb']
+                    and current['peak_rss_mb'] > previous['peak_rss_mb'] * (1 + tolerance)):
+                regressions.append((size, key, 'peak_rss_mb', previous['peak_rss_mb'], current['peak_rss_mb']))
+    return regressions
+
+
+def print_results(results, baseline, max_depth=2):
+    """Stage table per size, with the baseline wall time and ratio when there is one"""
+    for size, stages in results.items():
+        print()
+        print(f"📊 {size}")
+        print("=" * 100)
+        print(f"   {'Stage':<56} {'Wall (s)':>9} {'Baseline':>9} {'Ratio':>7} {'Peak RSS':>10}")
+        for key, current in stages.items():
+            depth = key.count(' / ')
+            if depth > max_depth:
+                continue
+            name = '  ' * depth + key.rsplit(' / ', 1)[-1]
+            previous = baseline.get(size, {}).get(key)
+            base = f"{previous['wall_seconds']:.3f}" if previous else "-"
+            ratio = (f"{current['wall_seconds'] / previous['wall_seconds']:.2f}x"
+                     if previous and previous['wall_seconds'] > 0 else "-")
+            rss = f"{current['peak_rss_mb']:.0f} MB" if current['peak_rss_mb'] is not None else "-"
+            print(f"   {name[:56]:<56} {current['wall_seconds']:>9.3f} {base:>9} {ratio:>7} {rss:>10}")
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Benchmark the report stages on synthetic data")
+    parser.add_argument('--sizes', nargs='+', default=DEFAULT_SIZES,
+                        help="ROWS:YEARS sizes to benchmark, e.g. 10k:3 1M:10 50M:20")
+    parser.add_argument('--repeat', type=int, default=3, help="Runs per size (medians are compared)")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed of the synthetic data")
+    parser.add_argument('--baseline', default=DEFAULT_BASELINE, help="Baseline results to compare against")
+    parser.add_argument('--save-baseline', action='store_true', help="Store this run as the new baseline")
+    parser.add_argument('--tolerance', type=float, default=0.25,
+                        help="Allowed slowdown before a stage counts as a regression (0.25 = 25%%)")
+    parser.add_argument('--output', default='benchmark_results.json', help="Where to write this run's results")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    results = run_benchmarks(args.sizes, args.repeat, args.seed)
+
+    baseline = {}
+    if os.path.exists(args.baseline) and not args.save_baseline:
+        with open(args.baseline, 'r') as f:
+            baseline = json.load(f)['results']
+    print_results(results, baseline)
+
+    document = {
+        'created': datetime.now().isoformat(),
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'results': results
+    }
+    with open(args.output, 'w') as f:
+        json.dump(document, f, indent=4)
+    if args.save_baseline:
+        with open(args.baseline, 'w') as f:
+            json.dump(document, f, indent=4)
+        print(f"\n✅ Baseline saved to '{args.baseline}'")
+        sys.exit(0)
+
+    regressions = find_regressions(results, baseline, args.tolerance)
+    print()
+    if not baseline:
+        print(f"⚠️  No baseline at '{args.baseline}', run with --save-baseline to create one")
+    for size, key, metric, previous, current in regressions:
+        print(f"❌ {size} {key}: {metric} {previous:.3f} -> {current:.3f}")
+    if baseline and not regressions:
+        print("✅ No regression against the baseline")
+    sys.exit(1 if regressions else 0)
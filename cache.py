@@ -0,0 +1,110 @@
+import os
+import json
+import shutil
+import hashlib
+
+DEFAULT_CACHE_DIR = '.report_cache'
+CACHE_FORMAT_VERSION = 1
+
+
+def _file_sha256(path, chunk_size=1024 * 1024):
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _pyarrow_feather():
+    """Return pyarrow.feather, or None when pyarrow is not installed"""
+    try:
+        import pyarrow.feather as feather
+    except ImportError:
+        return None
+    return feather
+
+
+class ColumnarCache:
+    """Typed columnar (Feather/Arrow IPC) copies of the CSV inputs.
+
+    The first read of a CSV stores the parsed DataFrame, datetimes included,
+    as an uncompressed Feather file next to a small metadata file. Later reads
+    memory-map that file as long as the source size and mtime are unchanged.
+    When only the mtime moved (e.g. the scraper rewrote identical content) the
+    SHA-256 of the source decides. Requires pyarrow; without it every read
+    falls through to the CSV loader.
+    """
+
+    def __init__(self, cache_dir=DEFAULT_CACHE_DIR, enabled=True):
+        self.cache_dir = cache_dir
+        self.feather = _pyarrow_feather() if enabled else None
+        self.enabled = self.feather is not None
+
+    def clear(self):
+        """Remove every cached file"""
+        if os.path.isdir(self.cache_dir):
+            shutil.rmtree(self.cache_dir)
+
+    def _paths(self, source_path):
+        name = os.path.basename(source_path)
+        return (os.path.join(self.cache_dir, name + '.feather'),
+                os.path.join(self.cache_dir, name + '.meta.json'))
+
+    def _read_meta(self, meta_path):
+        try:
+            with open(meta_path, 'r') as f:
+                return json.load(f)
+        except (OSError, ValueError):
+            return None
+
+    def _write_meta(self, meta_path, meta):
+        with open(meta_path, 'w') as f:
+            json.dump(meta, f, indent=4)
+
+    def _is_fresh(self, source_path, meta, meta_path, schema_key):
+        """Check the cached copy against the source's size, mtime and content hash"""
+        if meta is None or meta.get('version') != CACHE_FORMAT_VERSION or meta.get('schema') != schema_key:
+            return False
+        stat = os.stat(source_path)
+        if stat.st_size != meta['size']:
+            return False
+        if stat.st_mtime_ns == meta['mtime_ns']:
+            return True
+        # Same size but touched: only the content hash can tell
+        if _file_sha256(source_path) != meta['sha256']:
+            return False
+        meta['mtime_ns'] = stat.st_mtime_ns
+        self._write_meta(meta_path, meta)
+        return True
+
+    def load(self, source_path, schema_key, loader):
+        """Return (DataFrame, extra) for a source, calling loader() on a miss.
+
+        ``loader`` must return the typed DataFrame and a JSON-serializable
+        ``extra`` value that is stored with it (e.g. parse statistics).
+        ``schema_key`` invalidates the copy whenever the declared schema changes.
+        """
+        if not self.enabled:
+            return loader()
+
+        data_path, meta_path = self._paths(source_path)
+        meta = self._read_meta(meta_path)
+        if os.path.exists(data_path) and self._is_fresh(source_path, meta, meta_path, schema_key):
+            table = self.feather.read_table(data_path, memory_map=True)
+            return table.to_pandas(), meta['extra']
+
+        # Fingerprint before parsing so a concurrent rewrite invalidates the copy
+        stat = os.stat(source_path)
+        sha256 = _file_sha256(source_path)
+        df, extra = loader()
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.feather.write_feather(df, data_path, compression='uncompressed')
+        self._write_meta(meta_path, {
+            'version': CACHE_FORMAT_VERSION,
+            'schema': schema_key,
+            'size': stat.st_size,
+            'mtime_ns': stat.st_mtime_ns,
+            'sha256': sha256,
+            'extra': extra
+        })
+        return df, extra
@@ -1,10 +1,19 @@
-import pandas as pd
-import numpy as np
 from datetime import datetime, timedelta
 import json
+import argparse
+from events import AUTODEPLOY_EVENT, event_date
+from profiling import stage
+
+# pandas, numpy and the data loader are imported in the methods that use them,
+# so importing this module (e.g. from a CLI fast path) stays cheap
 
 class DevOpsCostSavingsCalculator:
-    def __init__(self):
+    def __init__(self, data=None):
+        from data_loader import ReportData
+
+        # Shared data source (frames are loaded once and reused by the dashboard)
+        self.data = data if data is not None else ReportData()
+        
         self.dev_hourly_rate = 50 
         
         self.incident_resolution_hours = 1
@@ -24,122 +33,199 @@ class DevOpsCostSavingsCalculator:
         
     def load_current_data(self):
         """Load existing dashboard data"""
-        # Read deployment data
-        df = pd.read_csv('deploy_prod_pipelines_2022_2025_argocd_refined.csv')
-        df['branch_creation_datetime'] = pd.to_datetime(df['branch_creation_datetime'], utc=True, format='mixed')
+        return self.data.deployments, self.data.ec2_costs
+    
+    # Model assumptions that can be swept by sensitivity.py
+    ASSUMPTIONS = (
+        'dev_hourly_rate',
+        'incident_resolution_hours',
+        'incident_stakeholder_hours',
+        'stakeholder_hourly_rate',
+        'deployment_impact_factor',
+        'testing_reduction_factor',
+        'revenue_feature_factor',
+        'revenue_per_feature_per_day',
+        'manual_testing_hours_saved'
+    )
+    
+    def assumptions(self):
+        """Current model assumptions as a dict"""
+        return {name: getattr(self, name) for name in self.ASSUMPTIONS}
+    
+    def monthly_inputs(self, df, ec2_df, period_stats=None):
+        """Monthly deployment metrics joined with the latest EC2 cost of each month"""
+        import numpy as np
+        import pandas as pd
+        from aggregation import deployment_period_stats
+
+        # Auto-deploy date from the same events config as the dashboard
+        autodeploy_date = event_date(self.data.event_config, AUTODEPLOY_EVENT)
         
-        # Read EC2 costs
-        ec2_df = pd.read_csv('ec2_costs_us_east_1.csv')
-        ec2_df['commit_date'] = pd.to_datetime(ec2_df['commit_date'])
+        # Calculate monthly metrics (single vectorized pass, see aggregation.py)
+        if period_stats is None:
+            period_stats = deployment_period_stats(df, freq='M')
+        monthly_stats = pd.DataFrame({
+            'year_month': period_stats['year_month'],
+            'total_deployments': period_stats['total_pipelines'],
+            'successful_deployments': period_stats['completed_pipelines'],
+            'avg_deployment_days': period_stats['avg_deployment_days'],
+            'failure_rate': period_stats['failure_rate'],
+            'is_post_autodeploy': period_stats['first_branch_creation'] >= autodeploy_date
+        })
         
-        return df, ec2_df
+        # EC2 costs for each month, joined on year_month (0 for months without EC2 data)
+        ec2_latest = self.monthly_ec2_costs(ec2_df)
+        months = pd.PeriodIndex(monthly_stats['year_month'])
+        monthly_stats['has_ec2'] = months.isin(ec2_latest.index)
+        monthly_stats['ec2_costs'] = np.where(monthly_stats['has_ec2'], ec2_latest.reindex(months).to_numpy(), 0)
+        return monthly_stats
     
-    def calculate_monthly_savings(self, df, ec2_df):
-        """Calculate monthly cost savings components"""
-        autodeploy_date = pd.to_datetime('2023-12-12T14:13:04.057Z')
+    def savings_components(self, monthly_stats, assumptions=None):
+        """Savings components for every month as whole-column expressions.
         
-        # Calculate monthly metrics
-        df['year_month'] = df['branch_creation_datetime'].dt.to_period('M')
-        monthly_stats = df.groupby('year_month').apply(lambda x: pd.Series({
-            'total_deployments': len(x),
-            'successful_deployments': len(x[x['deploy_prod_job_end_datetime'].notna()]),
-            'avg_deployment_days': x[x['days_elapsed_branch_to_deploy'] > 0]['days_elapsed_branch_to_deploy'].mean() if len(x[x['days_elapsed_branch_to_deploy'] > 0]) > 0 else 0,
-            'failure_rate': 1 - (len(x[x['deploy_prod_job_end_datetime'].notna()]) / len(x)) if len(x) > 0 else 0,
-            'is_post_autodeploy': x['branch_creation_datetime'].iloc[0] >= autodeploy_date
-        })).reset_index()
-        
-        # Calculate savings for each month
-        savings_data = []
+        ``assumptions`` overrides entries of assumptions(); values may be
+        scalars or arrays shaped (scenarios, 1), in which case every component
+        broadcasts to a (scenarios, months) matrix.
+        """
+        import numpy as np
+
+        params = self.assumptions()
+        if assumptions is not None:
+            params.update(assumptions)
         
         # Baseline metrics (pre-autodeploy averages) - realistic for small project
         baseline_avg_days = 6.5
         baseline_failure_rate = 0.941
         baseline_deployments_per_month = 25  # More realistic for small team
         
-        # Track total time saved
-        total_time_saved_days = 0
-        
-        for _, row in monthly_stats.iterrows():
-            month = row['year_month']
-            is_post = row['is_post_autodeploy']
-            
-            if is_post:
-                # Calculate time savings (much more conservative)
-                time_saved_days = max(0, baseline_avg_days - row['avg_deployment_days'])
-                # Track cumulative time saved for this month (apply realistic factor)
-                monthly_time_saved_days = time_saved_days * row['total_deployments'] * self.deployment_impact_factor
-                total_time_saved_days += monthly_time_saved_days
-                
-                # Calculate monetary value of time savings (separate from time tracking)
-                # Assumption: developers save 2 productive hours per day of deployment time reduction
-                productive_hours_saved_per_day = 2  # Only 2 productive hours saved per day of reduction
-                monetary_value_per_deployment = time_saved_days * productive_hours_saved_per_day * self.dev_hourly_rate
-                monthly_time_savings = monetary_value_per_deployment * row['total_deployments'] * self.deployment_impact_factor
-                
-                # Calculate failure cost savings  
-                baseline_failures = baseline_deployments_per_month * baseline_failure_rate
-                actual_failures = row['total_deployments'] * row['failure_rate']
-                failures_avoided = max(0, baseline_failures - actual_failures)
-                
-                failure_cost_per_incident = (
-                    self.incident_resolution_hours * self.dev_hourly_rate +
-                    self.incident_stakeholder_hours * self.stakeholder_hourly_rate
-                )
-                monthly_failure_savings = failures_avoided * failure_cost_per_incident
-                
-                # Manual testing savings (very conservative for small project)
-                manual_testing_savings = (
-                    row['total_deployments'] * 
-                    self.manual_testing_hours_saved * 
-                    self.dev_hourly_rate * self.testing_reduction_factor
-                )
-                
-                # Opportunity cost savings (minimal for small project)
-                opportunity_savings = (
-                    time_saved_days * 
-                    row['total_deployments'] * 
-                    self.revenue_per_feature_per_day * self.revenue_feature_factor
-                )
-                
-                total_monthly_savings = (
-                    monthly_time_savings + 
-                    monthly_failure_savings + 
-                    manual_testing_savings + 
-                    opportunity_savings
-                )
-            else:
-                total_monthly_savings = 0
-            
-            # Get EC2 costs for the month
-            month_str = str(month)
-            ec2_month_costs = 0
-            ec2_monthly = ec2_df[ec2_df['commit_date'].dt.to_period('M') == month]
-            if not ec2_monthly.empty:
-                ec2_month_costs = ec2_monthly['ec2_cost_usd'].iloc[-1]  # Take latest value
-            
-            savings_data.append({
-                'month': month_str,
-                'total_savings': total_monthly_savings,
-                'time_savings': monthly_time_savings if is_post else 0,
-                'failure_savings': monthly_failure_savings if is_post else 0,
-                'testing_savings': manual_testing_savings if is_post else 0,
-                'opportunity_savings': opportunity_savings if is_post else 0,
-                'ec2_costs': ec2_month_costs,
-                'net_savings': total_monthly_savings - ec2_month_costs if is_post else 0,
-                'is_post_autodeploy': is_post,
-                'deployments': row['total_deployments'],
-                'avg_deployment_days': row['avg_deployment_days']
-            })
-        
-        return pd.DataFrame(savings_data), total_time_saved_days
+        # Savings are zeroed before auto-deploy
+        is_post = monthly_stats['is_post_autodeploy'].to_numpy()
+        deployments = monthly_stats['total_deployments'].to_numpy()
+        
+        # Calculate time savings (much more conservative)
+        time_saved = baseline_avg_days - monthly_stats['avg_deployment_days'].to_numpy()
+        time_saved_days = np.where(time_saved > 0, time_saved, 0)
+        # Time saved per month (apply realistic factor)
+        monthly_time_saved_days = time_saved_days * deployments * params['deployment_impact_factor']
+        
+        # Calculate monetary value of time savings (separate from time tracking)
+        # Assumption: developers save 2 productive hours per day of deployment time reduction
+        productive_hours_saved_per_day = 2  # Only 2 productive hours saved per day of reduction
+        monetary_value_per_deployment = time_saved_days * productive_hours_saved_per_day * params['dev_hourly_rate']
+        monthly_time_savings = monetary_value_per_deployment * deployments * params['deployment_impact_factor']
+        
+        # Calculate failure cost savings
+        baseline_failures = baseline_deployments_per_month * baseline_failure_rate
+        actual_failures = deployments * monthly_stats['failure_rate'].to_numpy()
+        failures_diff = baseline_failures - actual_failures
+        failures_avoided = np.where(failures_diff > 0, failures_diff, 0)
+        
+        failure_cost_per_incident = (
+            params['incident_resolution_hours'] * params['dev_hourly_rate'] +
+            params['incident_stakeholder_hours'] * params['stakeholder_hourly_rate']
+        )
+        monthly_failure_savings = failures_avoided * failure_cost_per_incident
+        
+        # Manual testing savings (very conservative for small project)
+        manual_testing_savings = (
+            deployments * 
+            params['manual_testing_hours_saved'] * 
+            params['dev_hourly_rate'] * params['testing_reduction_factor']
+        )
+        
+        # Opportunity cost savings (minimal for small project)
+        opportunity_savings = (
+            time_saved_days * 
+            deployments * 
+            params['revenue_per_feature_per_day'] * params['revenue_feature_factor']
+        )
+        
+        total_monthly_savings = (
+            monthly_time_savings + 
+            monthly_failure_savings + 
+            manual_testing_savings + 
+            opportunity_savings
+        )
+        ec2_month_costs = monthly_stats['ec2_costs'].to_numpy()
+        
+        return {
+            'is_post_autodeploy': is_post,
+            'clamped_failures': ~(failures_diff > 0),
+            'time_saved_days': np.where(is_post, monthly_time_saved_days, 0),
+            'total_savings': np.where(is_post, total_monthly_savings, 0),
+            'time_savings': np.where(is_post, monthly_time_savings, 0),
+            'failure_savings': np.where(is_post, monthly_failure_savings, 0),
+            'testing_savings': np.where(is_post, manual_testing_savings, 0),
+            'opportunity_savings': np.where(is_post, opportunity_savings, 0),
+            'net_savings': np.where(is_post, total_monthly_savings - ec2_month_costs, 0)
+        }
+    
+    def calculate_monthly_savings(self, df, ec2_df, period_stats=None):
+        """Calculate monthly cost savings components"""
+        import pandas as pd
+
+        with stage('monthly savings inputs'):
+            monthly_stats = self.monthly_inputs(df, ec2_df, period_stats)
+        with stage('savings components', rows=len(monthly_stats)):
+            components = self.savings_components(monthly_stats)
+        is_post = components['is_post_autodeploy']
+        
+        # Track cumulative time saved (summed month by month, in order)
+        total_time_saved_days = sum(components['time_saved_days'][is_post].tolist())
+        
+        savings_df = pd.DataFrame({
+            'month': monthly_stats['year_month'].astype(str),
+            'total_savings': components['total_savings'],
+            'time_savings': components['time_savings'],
+            'failure_savings': components['failure_savings'],
+            'testing_savings': components['testing_savings'],
+            'opportunity_savings': components['opportunity_savings'],
+            'ec2_costs': monthly_stats['ec2_costs'],
+            'net_savings': components['net_savings'],
+            'is_post_autodeploy': is_post,
+            'deployments': monthly_stats['total_deployments'],
+            'avg_deployment_days': monthly_stats['avg_deployment_days']
+        })
+        
+        # Months that got a literal 0 (pre auto-deploy, clamped failures, no EC2 data) were
+        # written as integers; keep columns made only of those as integers in the CSV
+        integer_zero_rows = {
+            'total_savings': ~is_post,
+            'time_savings': ~is_post,
+            'failure_savings': ~is_post | components['clamped_failures'],
+            'testing_savings': ~is_post,
+            'opportunity_savings': ~is_post,
+            'ec2_costs': ~monthly_stats['has_ec2'].to_numpy(),
+            'net_savings': ~is_post
+        }
+        for column, rows in integer_zero_rows.items():
+            if rows.all():
+                savings_df[column] = savings_df[column].astype(int)
+        
+        return savings_df, total_time_saved_days
+    
+    def monthly_ec2_costs(self, ec2_df):
+        """Latest EC2 cost of each month, indexed by year_month"""
+        import pandas as pd
+
+        # year_month is computed once for all EC2 rows, the last row of each month wins
+        costs = pd.Series(ec2_df['ec2_cost_usd'].to_numpy(), index=ec2_df['commit_date'].dt.to_period('M'))
+        costs = costs[costs.index.notna()]
+        return costs[~costs.index.duplicated(keep='last')]
     
     # Removed projections - only using historical actual data
     
-    def calculate_total_savings(self):
+    def calculate_total_savings(self, df=None, ec2_df=None):
         """Calculate and return only historical actual savings"""
-        # Load data and calculate savings
-        df, ec2_df = self.load_current_data()
-        historical_savings, total_time_saved_days = self.calculate_monthly_savings(df, ec2_df)
+        # Load data (unless frames were injected) and calculate savings
+        period_stats = None
+        if df is None:
+            # Shared monthly stats, the raw rows are not needed (and may be streamed)
+            period_stats = self.data.deployment_stats('M')
+        if ec2_df is None:
+            ec2_df = self.data.ec2_costs
+        with stage('cost savings calculation'):
+            historical_savings, total_time_saved_days = self.calculate_monthly_savings(df, ec2_df, period_stats)
         
         # Historical actual savings (2024-2025 observed)
         historical_actual = historical_savings[historical_savings['is_post_autodeploy']]['net_savings'].sum()
@@ -166,9 +252,9 @@ class DevOpsCostSavingsCalculator:
         
         return results
 
-def create_cost_savings_report():
+def create_cost_savings_report(data=None):
     """Generate historical cost savings report"""
-    calculator = DevOpsCostSavingsCalculator()
+    calculator = DevOpsCostSavingsCalculator(data)
     results = calculator.calculate_total_savings()
     
     print("💰 DEVOPS COST SAVINGS ANALYSIS (HISTORICAL ACTUAL)")
@@ -213,4 +299,14 @@ def create_cost_savings_report():
     return results
 
 if __name__ == "__main__":
-    results = create_cost_savings_report()
+    from data_loader import ReportData, DEFAULT_STORE_FILE
+
+    parser = argparse.ArgumentParser(description="Print the historical cost savings analysis")
+    parser.add_argument('--store', nargs='?', const=DEFAULT_STORE_FILE, metavar='SQLITE',
+                        help="Read the inputs from the SQLite store filled by store.py "
+                             f"(default: {DEFAULT_STORE_FILE})")
+    parser.add_argument('--incremental', action='store_true',
+                        help="Reuse the monthly stats of the last run and, when the deployment export only grew, "
+                             "recompute just the months of the appended rows")
+    args = parser.parse_args()
+    results = create_cost_savings_report(ReportData(store=args.store, incremental=args.incremental))
@@ -0,0 +1,236 @@
+import os
+import re
+import json
+import gzip
+import base64
+from profiling import stage
+
+TEMPLATE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'dashboard_template.html')
+
+# Chart.js from the CDN unless a local build is inlined for offline use
+CHARTJS_CDN_TAG = '<script src="https://cdn.jsdelivr.net/npm/chart.js"></script>'
+LOGO_FILE = 'tonyengineering.png'
+LOGO_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), LOGO_FILE)
+
+# Profiled pages only: mark the time to first chart (skipped if Chart.js failed to load)
+FIRST_CHART_TIMING_SCRIPT = """
+    <script>
+        // Time to first chart: marked once the first chart has drawn
+        if (typeof Chart !== 'undefined') {
+            Chart.register({
+                id: 'firstChartTiming',
+                afterRender: function() {
+                    if (!performance.getEntriesByName('first-chart').length) {
+                        performance.mark('first-chart');
+                        console.log('First chart rendered after ' + Math.round(performance.now()) + ' ms');
+                    }
+                }
+            });
+        }
+    </script>"""
+
+# Per-run blocks are marked @@name@@ in the template; everything else is static
+SLOT_PATTERN = re.compile(r'@@([a-z_]+)@@')
+
+# Parsed templates and inlined assets kept in memory for the life of the process
+_templates = {}
+_assets = {}
+
+# How the data is embedded: indented JSON, compact typed-array JSON, or gzipped compact JSON
+# ('auto' picks compact when the data embeds day-level series, see auto_payload())
+PAYLOAD_FORMATS = ('auto', 'json', 'compact', 'gzip')
+
+# Granularity views with one point per day or week (thousands of points over a few years)
+FINE_GRANULARITIES = ('D', 'W')
+
+# Label series under these keys share one time axis in the compact payload
+TIME_AXIS_KEY = re.compile(r'(^|_)(months|periods)$')
+
+# In-page decoder for the compact payload (typed arrays are little-endian like every browser)
+PAYLOAD_DECODER = """
+        // Decode the compact payload: shared time axis slices and base64 typed arrays
+        function base64Buffer(text) {
+            return Uint8Array.from(atob(text), (c) => c.charCodeAt(0)).buffer;
+        }
+        function unpackDashboard(payload) {
+            const unpack = (value) => {
+                if (Array.isArray(value)) return value.map(unpack);
+                if (value === null || typeof value !== 'object') return value;
+                if ('$axis' in value) return payload.axis.slice(value.$axis[0], value.$axis[0] + value.$axis[1]);
+                if ('$axis_i32' in value) return Array.from(new Int32Array(base64Buffer(value.$axis_i32)), (i) => payload.axis[i]);
+                if ('$i32' in value) return Array.from(new Int32Array(base64Buffer(value.$i32)));
+                // Float32 series only hold values of up to 7 significant digits; NaN marks a missing value
+                if ('$f32' in value) return Array.from(new Float32Array(base64Buffer(value.$f32)),
+                    (v) => isNaN(v) ? null : parseFloat(v.toPrecision(7)));
+                if ('$f64' in value) return Array.from(new Float64Array(base64Buffer(value.$f64)),
+                    (v) => isNaN(v) ? null : v);
+                return Object.fromEntries(Object.entries(value).map(([k, v]) => [k, unpack(v)]));
+            };
+            return unpack(payload.data);
+        }
+        async function gunzipJson(text) {
+            const stream = new Blob([base64Buffer(text)]).stream().pipeThrough(new DecompressionStream('gzip'));
+            return JSON.parse(await new Response(stream).text());
+        }"""
+
+
+def load_template(path=TEMPLATE_PATH):
+    """Parse a template once into static text and slot names, then reuse it"""
+    if path not in _templates:
+        with open(path, 'r') as f:
+            parts = SLOT_PATTERN.split(f.read())
+        # Even positions are static text, odd positions are slot names
+        _templates[path] = (parts[0::2], parts[1::2])
+    return _templates[path]
+
+
+def render_blocks(blocks, path=TEMPLATE_PATH):
+    """Yield the page as static text interleaved with the given per-run blocks"""
+    static_parts, slots = load_template(path)
+    missing = set(slots) - set(blocks)
+    if missing:
+        raise KeyError(f"Missing dashboard blocks: {', '.join(sorted(missing))}")
+    for static_part, slot in zip(static_parts, slots):
+        yield static_part
+        yield blocks[slot]
+    yield static_parts[-1]
+
+
+def _inline_asset(path, encode):
+    """Read and encode a file once per process"""
+    key = (path, encode)
+    if key not in _assets:
+        with open(path, 'rb') as f:
+            _assets[key] = encode(f.read())
+    return _assets[key]
+
+
+def _script_tag(content):
+    # A literal </script> inside the bundle would close the tag early
+    code = content.decode('utf-8').replace('</script', '<\\/script')
+    return f'<script>{code}</script>'
+
+
+def _png_data_uri(content):
+    return 'data:image/png;base64,' + base64.b64encode(content).decode('ascii')
+
+
+def asset_blocks(chartjs_file=None, logo_path=LOGO_PATH):
+    """Chart.js and logo references, or both inlined so the page renders with no network"""
+    if chartjs_file is None:
+        return {'chartjs_script': CHARTJS_CDN_TAG, 'logo_src': LOGO_FILE}
+    return {
+        'chartjs_script': _inline_asset(chartjs_file, _script_tag),
+        'logo_src': _inline_asset(logo_path, _png_data_uri)
+    }
+
+
+def _base64(array):
+    return base64.b64encode(array.tobytes()).decode('ascii')
+
+
+def _float32_exact(array):
+    """Whether the decoder's Float32 + toPrecision(7) round trip gives back every value exactly"""
+    import numpy as np
+    decoded = np.array([float(f'{value:.7g}') for value in array.astype('<f4').astype(float)])
+    return bool(((decoded == array) | np.isnan(array)).all())
+
+
+def _pack_numbers(values):
+    """Pack a numeric list as little-endian Int32 if every value is whole, else Float32 if lossless, else Float64"""
+    # Imported here so the CLI's fast paths never pay for numpy
+    import numpy as np
+    array = np.array([np.nan if value is None else value for value in values], dtype=float)
+    if np.isfinite(array).all() and (array == np.round(array)).all() and np.abs(array).max() < 2**31:
+        return {'$i32': _base64(array.astype('<i4'))}
+    if _float32_exact(array):
+        return {'$f32': _base64(array.astype('<f4'))}
+    return {'$f64': _base64(array.astype('<f8'))}
+
+
+def _pack_labels(labels, positions):
+    """Reference the shared time axis: a slice when the labels are contiguous, else Int32 positions"""
+    import numpy as np
+    indexes = [positions[label] for label in labels]
+    if indexes == list(range(indexes[0], indexes[0] + len(indexes))):
+        return {'$axis': [indexes[0], len(indexes)]}
+    return {'$axis_i32': _base64(np.array(indexes, dtype='<i4'))}
+
+
+def _axis_labels(value, key=''):
+    """All period labels found under time axis keys"""
+    if isinstance(value, dict):
+        return set().union(*(_axis_labels(v, k) for k, v in value.items()))
+    if isinstance(value, list) and TIME_AXIS_KEY.search(key):
+        return set(value)
+    return set()
+
+
+def _pack(value, positions, key=''):
+    if isinstance(value, dict):
+        return {k: _pack(v, positions, k) for k, v in value.items()}
+    if not isinstance(value, list) or not value:
+        return value
+    if TIME_AXIS_KEY.search(key):
+        return _pack_labels(value, positions)
+    numeric = all(v is None or (isinstance(v, (int, float)) and not isinstance(v, bool)) for v in value)
+    if numeric and any(v is not None for v in value):
+        return _pack_numbers(value)
+    return value
+
+
+def compact_payload(dashboard_data):
+    """Dashboard data with one shared time axis and numeric series as base64 typed arrays"""
+    axis = sorted(_axis_labels(dashboard_data))
+    positions = {label: i for i, label in enumerate(axis)}
+    return {'axis': axis, 'data': _pack(dashboard_data, positions)}
+
+
+def auto_payload(dashboard_data):
+    """'compact' when the data embeds day-level series (daily/weekly views or rolling DORA metrics), else 'json'
+
+    Those series make indented JSON over 10x larger than the compact payload.
+    """
+    fine = any(freq in (dashboard_data.get('granularities') or {}) for freq in FINE_GRANULARITIES)
+    return 'compact' if fine or dashboard_data.get('dora') else 'json'
+
+
+def payload_blocks(dashboard_data, payload='auto'):
+    """Data blocks for the chosen payload format"""
+    if payload == 'auto':
+        payload = auto_payload(dashboard_data)
+    if payload == 'json':
+        return {'script_attributes': '', 'payload_decoder': '',
+                'dashboard_data': json.dumps(dashboard_data, indent=12)}
+    if payload not in PAYLOAD_FORMATS:
+        raise ValueError(f"Unknown payload format: {payload}")
+
+    packed = json.dumps(compact_payload(dashboard_data), separators=(',', ':'))
+    if payload == 'compact':
+        return {'script_attributes': '', 'payload_decoder': PAYLOAD_DECODER,
+                'dashboard_data': f'unpackDashboard({packed})'}
+    # Decompression is async, so the page script runs as a module with top-level await
+    compressed = base64.b64encode(gzip.compress(packed.encode('utf-8'), mtime=0)).decode('ascii')
+    return {'script_attributes': ' type="module"', 'payload_decoder': PAYLOAD_DECODER,
+            'dashboard_data': f'unpackDashboard(await gunzipJson("{compressed}"))'}
+
+
+def dashboard_blocks(dashboard_data, payload='auto', chartjs_file=None, first_chart_timing=False):
+    """Per-run blocks injected into the static dashboard shell"""
+    return {**asset_blocks(chartjs_file), **payload_blocks(dashboard_data, payload),
+            'timing_script': FIRST_CHART_TIMING_SCRIPT if first_chart_timing else ''}
+
+
+def render_dashboard(dashboard_data, path=TEMPLATE_PATH, payload='auto', chartjs_file=None,
+                     first_chart_timing=False):
+    """Return the dashboard HTML for one run"""
+    return ''.join(render_blocks(dashboard_blocks(dashboard_data, payload, chartjs_file, first_chart_timing), path))
+
+
+def write_dashboard(dashboard_data, output_path, path=TEMPLATE_PATH, payload='auto', chartjs_file=None,
+                    first_chart_timing=False):
+    """Write the dashboard HTML without building the whole page in memory first"""
+    with stage('serialize dashboard data'):
+        blocks = dashboard_blocks(dashboard_data, payload, chartjs_file, first_chart_timing)
+    with stage('write HTML'), open(output_path, 'w') as f:
+        f.writelines(render_blocks(blocks, path))
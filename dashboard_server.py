@@ -0,0 +1,165 @@
+import os
+import json
+import hashlib
+import argparse
+import threading
+from collections import OrderedDict
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from data_loader import ReportData
+from dashboard_renderer import render_dashboard, PAYLOAD_FORMATS, LOGO_FILE, LOGO_PATH
+from create_devops_impact_report import build_dashboard_data
+from profiling import profiler
+
+DEFAULT_HOST = '127.0.0.1'
+DEFAULT_PORT = 8050
+DEFAULT_MAX_TENANTS = 8
+
+
+class TenantDashboard:
+    """One tenant's parsed inputs and aggregates kept in memory between requests.
+
+    Each request stats the input files; only the files that changed are
+    re-read and re-aggregated (see ReportData.refresh()), and the page is
+    re-rendered only when the dashboard data itself changed. A failed rebuild
+    keeps the changes pending, so the next request tries again.
+    """
+
+    def __init__(self, data_dir, payload='auto', chartjs_file=None):
+        self.data = ReportData(data_dir)
+        self.payload = payload
+        self.chartjs_file = chartjs_file
+        self.etag = None
+        self.data_json = None
+        self.html = None
+        self._lock = threading.Lock()
+
+    def current(self):
+        """Return (etag, data.json bytes, HTML bytes), rebuilding only after an input changed"""
+        with self._lock:
+            changed = self.data.refresh()
+            if changed or self.etag is None:
+                # Keep only this rebuild's stage timings (the profiler's records are per thread)
+                profiler.reset()
+                dashboard_data = build_dashboard_data(self.data)
+                data_json = json.dumps(dashboard_data)
+                etag = hashlib.sha256(data_json.encode('utf-8')).hexdigest()[:20]
+                if etag != self.etag:
+                    self.data_json = data_json.encode('utf-8')
+                    self.html = render_dashboard(dashboard_data, payload=self.payload,
+                                                 chartjs_file=self.chartjs_file).encode('utf-8')
+                    self.etag = etag
+                self.data.mark_current(changed)
+            return self.etag, self.data_json, self.html
+
+
+class TenantCache:
+    """Least recently used tenants kept in memory, at most max_tenants at a time"""
+
+    def __init__(self, tenant_dirs, max_tenants=DEFAULT_MAX_TENANTS, payload='auto', chartjs_file=None):
+        self.tenant_dirs = OrderedDict()
+        for tenant_dir in tenant_dirs:
+            name = os.path.basename(os.path.abspath(tenant_dir))
+            if name in self.tenant_dirs:
+                raise ValueError(f"Two tenant directories are named '{name}'")
+            self.tenant_dirs[name] = tenant_dir
+        self.max_tenants = max_tenants
+        self.payload = payload
+        self.chartjs_file = chartjs_file
+        self._tenants = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def default_tenant(self):
+        return next(iter(self.tenant_dirs))
+
+    def get(self, name):
+        """The tenant's dashboard state, loading it (and evicting the oldest) if needed; None if unknown"""
+        if name not in self.tenant_dirs:
+            return None
+        with self._lock:
+            if name in self._tenants:
+                self._tenants.move_to_end(name)
+            else:
+                self._tenants[name] = TenantDashboard(self.tenant_dirs[name], self.payload, self.chartjs_file)
+                while len(self._tenants) > self.max_tenants:
+                    self._tenants.popitem(last=False)
+            return self._tenants[name]
+
+
+class DashboardRequestHandler(BaseHTTPRequestHandler):
+    """Serve /, /data.json and /<tenant>/, /<tenant>/data.json with ETag revalidation"""
+
+    tenants = None
+
+    def do_GET(self):
+        parts = [part for part in self.path.split('?', 1)[0].split('/') if part]
+        if parts and parts[-1] == LOGO_FILE:
+            with open(LOGO_PATH, 'rb') as f:
+                return self._send(200, 'image/png', f.read())
+
+        name = parts.pop(0) if parts and parts[0] in self.tenants.tenant_dirs else self.tenants.default_tenant
+        if parts not in ([], ['data.json']):
+            return self._send(404, 'text/plain; charset=utf-8', b'Not found\n')
+
+        try:
+            etag, data_json, html = self.tenants.get(name).current()
+        except Exception as e:
+            return self._send(500, 'text/plain; charset=utf-8', f"{type(e).__name__}: {e}\n".encode('utf-8'))
+
+        if parts == ['data.json']:
+            self._send_versioned(f'"{etag}-json"', 'application/json', data_json)
+        else:
+            self._send_versioned(f'"{etag}-html"', 'text/html; charset=utf-8', html)
+
+    def _send_versioned(self, etag, content_type, body):
+        """Answer 304 when the client already has this version"""
+        if_none_match = self.headers.get('If-None-Match', '')
+        if etag in [tag.strip() for tag in if_none_match.split(',')] or if_none_match.strip() == '*':
+            return self._send(304, None, b'', {'ETag': etag})
+        self._send(200, content_type, body, {'ETag': etag, 'Cache-Control': 'no-cache'})
+
+    def _send(self, status, content_type, body, headers=None):
+        self.send_response(status)
+        if content_type:
+            self.send_header('Content-Type', content_type)
+            self.send_header('Content-Length', str(len(body)))
+        for header, value in (headers or {}).items():
+            self.send_header(header, value)
+        self.end_headers()
+        if body and self.command != 'HEAD':
+            self.wfile.write(body)
+
+    do_HEAD = do_GET
+
+
+def create_server(tenant_dirs, host=DEFAULT_HOST, port=DEFAULT_PORT, max_tenants=DEFAULT_MAX_TENANTS,
+                  payload='auto', chartjs_file=None):
+    """HTTP server bound to host:port serving the given tenant data directories"""
+    handler = type('Handler', (DashboardRequestHandler,), {
+        'tenants': TenantCache(tenant_dirs, max_tenants, payload, chartjs_file)
+    })
+    return ThreadingHTTPServer((host, port), handler)
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Serve the auto-deploy impact dashboard from memory")
+    parser.add_argument('tenant_dirs', nargs='*', default=['.'],
+                        help="Tenant data directories, served at /<dir name>/ (the first one also at /)")
+    parser.add_argument('--host', default=DEFAULT_HOST, help="Address to bind")
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT, help="Port to listen on")
+    parser.add_argument('--max-tenants', type=int, default=DEFAULT_MAX_TENANTS,
+                        help="Tenants kept in memory at once (least recently used are dropped)")
+    parser.add_argument('--payload', choices=PAYLOAD_FORMATS, default='auto',
+                        help="How the page embeds the dashboard data")
+    parser.add_argument('--chartjs-file', help="Inline this local Chart.js build instead of using the CDN")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    server = create_server(args.tenant_dirs, args.host, args.port, args.max_tenants, args.payload, args.chartjs_file)
+    print(f"🌐 Serving {len(args.tenant_dirs)} tenant dashboard(s) on http://{args.host}:{args.port}/")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Server stopped")
@@ -0,0 +1,319 @@
+import os
+import json
+from cache import ColumnarCache, DEFAULT_CACHE_DIR
+from profiling import stage
+from events import EVENTS_JSON
+
+# pandas and the aggregation modules are imported in the methods that use them,
+# so importing this module (e.g. for the file names) stays cheap
+
+# Input files expected in the data directory
+DEPLOYMENTS_CSV = 'deploy_prod_pipelines_2022_2025_argocd_refined.csv'
+COVERAGE_CSV = 'coverage_data_unit_tests.csv'
+E2E_CSV = 'coverage_e2e_tests_count.csv'
+EC2_COSTS_CSV = 'ec2_costs_us_east_1.csv'
+FEATURE_ENVS_CSV = 'feature_environments_created_count.csv'
+PIPELINE_CORRELATION_CSV = 'pipeline_success_failure_correlation.csv'
+PIPELINE_METRICS_JSON = 'data_pipeline_correlation_metrics_filtered.json'
+
+# SQLite store of the inputs written by store.py (see ReportData's ``store``)
+DEFAULT_STORE_FILE = 'report_store.sqlite'
+
+# Loaded sources and the aggregates derived from them, per input file
+SOURCE_FILES = {
+    DEPLOYMENTS_CSV: ('deployments', 'streamed_deployments', 'deployment_stats', 'deployment_split',
+                      'deployment_rollups', 'event_splits', 'dora_metrics'),
+    COVERAGE_CSV: ('coverage',),
+    E2E_CSV: ('e2e_tests',),
+    EC2_COSTS_CSV: ('ec2_costs',),
+    FEATURE_ENVS_CSV: ('feature_envs',),
+    PIPELINE_CORRELATION_CSV: ('pipeline_success',),
+    PIPELINE_METRICS_JSON: ('pipeline_metrics',),
+    # Streaming accumulates the split at the auto-deploy event date
+    EVENTS_JSON: ('event_config', 'streamed_deployments')
+}
+
+
+class ReportData:
+    """Load every report input once and hand back already-typed DataFrames.
+
+    Each source is read lazily on first access and kept for the rest of the
+    run, so the dashboard and the cost savings calculator share one parse.
+    Frames are shared between consumers and must not be modified in place.
+    CSV sources go through a ColumnarCache (under ``data_dir`` by default);
+    pass ``cache=ColumnarCache(enabled=False)`` to always read the CSVs.
+    With ``streaming=True`` the deployment export is never loaded whole: its
+    stats are folded chunk by chunk (approximate median/p90), and only the
+    ``split_date`` given here (the auto-deploy event date by default) is
+    available to deployment_split().
+    ``sketch_accuracy`` switches median/p90 to mergeable quantile sketches
+    (kept in the stats so they can be rolled up, see aggregation.py).
+    ``backend`` picks the engine of the row-level aggregations: 'pandas' or
+    the multi-threaded 'arrow' (identical results, see aggregation_backend()).
+    ``store`` reads everything from a SQLite store filled by store.py instead
+    of the CSVs: the deployment aggregates come from its maintained day and
+    month tables, so no deployment row is scanned and a daily delta only
+    re-aggregates the days and months it touches.
+    With ``incremental=True`` deployment_stats() keeps its per-period stats
+    in the cache directory and, when the export only grew, parses just the
+    appended rows and recomputes only the periods they fall in (identical
+    results, see incremental.py).
+    """
+
+    def __init__(self, data_dir='.', cache=None, streaming=False, chunksize=None, split_date=None,
+                 sketch_accuracy=None, backend='pandas', store=None, incremental=False):
+        if store is not None and streaming:
+            raise ValueError("The store already keeps the aggregates current; it cannot be combined with streaming")
+        if incremental and (store is not None or streaming):
+            raise ValueError("Incremental stats are read from the CSV export; they cannot be combined with "
+                             "the store or streaming")
+        self.data_dir = data_dir
+        self.cache = cache if cache is not None else ColumnarCache(os.path.join(data_dir, DEFAULT_CACHE_DIR))
+        self.streaming = streaming
+        self.chunksize = chunksize
+        self.split_date = split_date
+        self.sketch_accuracy = sketch_accuracy
+        self.backend = backend
+        self.store = store
+        self._store = None
+        self.incremental = incremental
+        self._sources = {}
+        # Rows per file/column that missed the declared datetime format
+        self.parse_fallbacks = {}
+        # (size, mtime_ns) of each input as of the last mark_current()
+        self._signatures = {}
+
+    def _path(self, filename):
+        return os.path.join(self.data_dir, filename)
+
+    def _get(self, name, loader):
+        if name not in self._sources:
+            self._sources[name] = loader()
+        return self._sources[name]
+
+    def _report_store(self):
+        from store import ReportStore
+        if self._store is None:
+            if not os.path.exists(self.store):
+                raise FileNotFoundError(f"{self.store} does not exist; fill it with store.py first")
+            self._store = ReportStore(self.store)
+        return self._store
+
+    def _read_csv(self, filename):
+        from schema import SCHEMAS, read_csv_with_schema
+        if self.store is not None:
+            store = self._report_store()
+            with stage(f'load {filename} from the store') as record:
+                df = store.read_deployments() if filename == DEPLOYMENTS_CSV else store.read_table(filename)
+                record['rows'] = len(df)
+            return df
+        path = self._path(filename)
+        schema = SCHEMAS[filename]
+        with stage(f'load {filename}') as record:
+            df, fallbacks = self.cache.load(path, json.dumps(schema, sort_keys=True),
+                                            lambda: read_csv_with_schema(path, schema))
+            record['rows'] = len(df)
+        for column, rows in fallbacks.items():
+            self.parse_fallbacks[(filename, column)] = rows
+            if rows:
+                print(f"⚠️  {filename}: {rows:,} of {len(df):,} '{column}' values needed slow datetime parsing")
+        return df
+
+    def _signature(self, path):
+        try:
+            stat = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_size, stat.st_mtime_ns)
+
+    def refresh(self):
+        """Forget the inputs that changed on disk since they were last marked current, with their aggregates.
+
+        Returns {file name: (size, mtime_ns)} of the changed files (all of them
+        on the first call). Sources from unchanged files stay in memory, so a
+        long-running process only re-reads and re-aggregates what actually
+        changed. Pass the result to mark_current() once everything built from
+        it succeeded; until then the same files keep coming back as changed.
+        """
+        changed = {}
+        for filename, names in SOURCE_FILES.items():
+            # In store mode every source changes with the store file
+            signature = self._signature(self.store if self.store is not None and filename != EVENTS_JSON
+                                        else self._path(filename))
+            if self._signatures.get(filename, False) == signature:
+                continue
+            changed[filename] = signature
+            for key in list(self._sources):
+                if (key[0] if isinstance(key, tuple) else key) in names:
+                    del self._sources[key]
+        return changed
+
+    def mark_current(self, signatures):
+        """Record the file signatures returned by refresh() after a successful rebuild"""
+        self._signatures.update(signatures)
+
+    def _load_pipeline_metrics(self):
+        if self.store is not None:
+            return self._report_store().read_document(PIPELINE_METRICS_JSON)
+        with stage(f'load {PIPELINE_METRICS_JSON}'), open(self._path(PIPELINE_METRICS_JSON), 'r') as f:
+            return json.load(f)
+
+    @property
+    def deployments(self):
+        """Deployment pipelines with parsed branch_creation_datetime (UTC)"""
+        return self._get('deployments', lambda: self._read_csv(DEPLOYMENTS_CSV))
+
+    @property
+    def coverage(self):
+        """Unit test coverage with parsed commit_date"""
+        return self._get('coverage', lambda: self._read_csv(COVERAGE_CSV))
+
+    @property
+    def e2e_tests(self):
+        """E2E test counts with parsed commit_date"""
+        return self._get('e2e_tests', lambda: self._read_csv(E2E_CSV))
+
+    @property
+    def ec2_costs(self):
+        """EC2 costs with parsed commit_date"""
+        return self._get('ec2_costs', lambda: self._read_csv(EC2_COSTS_CSV))
+
+    @property
+    def feature_envs(self):
+        """Feature environments created per month"""
+        return self._get('feature_envs', lambda: self._read_csv(FEATURE_ENVS_CSV))
+
+    @property
+    def pipeline_success(self):
+        """Data pipeline success/failure correlation"""
+        return self._get('pipeline_success', lambda: self._read_csv(PIPELINE_CORRELATION_CSV))
+
+    @property
+    def pipeline_metrics(self):
+        """Data pipeline metrics (filtered to exclude scheduled ingestions)"""
+        return self._get('pipeline_metrics', self._load_pipeline_metrics)
+
+    @property
+    def event_config(self):
+        """Transformation events and window (events.json in the data directory, else the defaults)"""
+        from events import load_events
+        return self._get('event_config', lambda: load_events(self._path(EVENTS_JSON)))
+
+    def _streamed_deployments(self, freq):
+        from streaming import stream_deployments, DEFAULT_CHUNKSIZE
+        from quantile_sketch import DEFAULT_RELATIVE_ACCURACY
+        from events import AUTODEPLOY_EVENT, event_date
+
+        def stream():
+            split_date = self.split_date or event_date(self.event_config, AUTODEPLOY_EVENT)
+            with stage(f'stream {DEPLOYMENTS_CSV}') as record:
+                accumulator = stream_deployments(self._path(DEPLOYMENTS_CSV), freq, split_date,
+                                                 self.chunksize or DEFAULT_CHUNKSIZE,
+                                                 self.sketch_accuracy or DEFAULT_RELATIVE_ACCURACY)
+                record['rows'] = accumulator.rows
+            self.parse_fallbacks[(DEPLOYMENTS_CSV, 'branch_creation_datetime')] = accumulator.parse_fallbacks
+            if accumulator.parse_fallbacks:
+                print(f"⚠️  {DEPLOYMENTS_CSV}: {accumulator.parse_fallbacks:,} of {accumulator.rows:,} "
+                      f"'branch_creation_datetime' values needed slow datetime parsing")
+            return accumulator
+        return self._get(('streamed_deployments', freq), stream)
+
+    def deployment_stats(self, freq='M'):
+        """Per-period deployment stats, shared by the dashboard and the calculator"""
+        from aggregation import aggregation_backend
+
+        period_stats, _ = aggregation_backend(self.backend)
+
+        def compute():
+            if self.streaming:
+                return self._streamed_deployments(freq).period_stats()
+            if self.store is not None:
+                store = self._report_store()
+                with stage(f'read deployment stats ({freq}) from the store'):
+                    return store.monthly_stats() if freq == 'M' else store.rollups((freq,), key='year_month')[freq]
+            if self.incremental:
+                from incremental import incremental_period_stats
+                with stage(f'update deployment stats ({freq}) incrementally'):
+                    return incremental_period_stats(self._path(DEPLOYMENTS_CSV), self.cache.cache_dir, freq,
+                                                    sketch_accuracy=self.sketch_accuracy,
+                                                    load_rows=lambda: self.deployments)
+            deployments = self.deployments
+            with stage(f'aggregate deployment stats ({freq})', rows=len(deployments)):
+                return period_stats(deployments, freq, sketch_accuracy=self.sketch_accuracy)
+        return self._get(('deployment_stats', freq), compute)
+
+    def deployment_rollups(self, freqs=('D', 'W', 'M', 'Q')):
+        """Per-period deployment stats at each frequency in ``freqs`` (finest first), from one pass over the rows"""
+        from aggregation import period_rollups
+        from quantile_sketch import DEFAULT_RELATIVE_ACCURACY
+
+        def compute():
+            if self.store is not None:
+                with stage(f"roll up deployment stats ({', '.join(freqs)}) from the store"):
+                    return self._report_store().rollups(freqs)
+            deployments = self.deployments
+            with stage(f"roll up deployment stats ({', '.join(freqs)})", rows=len(deployments)):
+                return period_rollups(deployments, freqs,
+                                      relative_accuracy=self.sketch_accuracy or DEFAULT_RELATIVE_ACCURACY)
+        return self._get(('deployment_rollups', tuple(freqs)), compute)
+
+    def dora_metrics(self, windows=(7, 30, 90)):
+        """Rolling deployment frequency, lead time and change failure rate at every day (see dora_metrics.py)"""
+        from dora_metrics import rolling_dora_from_daily, rolling_dora_metrics
+        from quantile_sketch import DEFAULT_RELATIVE_ACCURACY
+
+        def compute():
+            if self.store is not None:
+                store = self._report_store()
+                with stage(f"rolling DORA metrics ({', '.join(f'{window}d' for window in windows)}) from the store"):
+                    return rolling_dora_from_daily(*store.daily_lead_time_totals(), windows,
+                                                   relative_accuracy=store.relative_accuracy)
+            deployments = self.deployments
+            with stage(f"rolling DORA metrics ({', '.join(f'{window}d' for window in windows)})",
+                       rows=len(deployments)):
+                return rolling_dora_metrics(deployments, windows,
+                                            relative_accuracy=self.sketch_accuracy or DEFAULT_RELATIVE_ACCURACY)
+        return self._get(('dora_metrics', tuple(windows)), compute)
+
+    def deployment_split(self, split_date):
+        """Deployment totals before and after split_date"""
+        import pandas as pd
+        from aggregation import aggregation_backend
+
+        if self.streaming:
+            accumulator = self._streamed_deployments('M')
+            if accumulator.split_date is None or accumulator.split_date != pd.to_datetime(split_date):
+                raise ValueError(f"Streaming mode only accumulates the split at {accumulator.split_date}, "
+                                 f"not {split_date}")
+            return accumulator.split_stats()
+        def compute():
+            if self.store is not None:
+                with stage('split deployments before/after in the store'):
+                    return self._report_store().split_stats(split_date)
+            _, split_stats = aggregation_backend(self.backend)
+            deployments = self.deployments
+            with stage('split deployments before/after', rows=len(deployments)):
+                return split_stats(deployments, split_date)
+        return self._get(('deployment_split', str(split_date)), compute)
+
+    def event_splits(self, dates, window=None):
+        """Deployment totals before and after each of ``dates`` (within ``window`` of it), from one sorted pass"""
+        from aggregation import event_split_stats
+
+        if self.streaming:
+            # Only the accumulated (whole history) split is known without the rows
+            splits = []
+            for date in dates:
+                try:
+                    splits.append(self.deployment_split(date) if window is None else None)
+                except ValueError:
+                    splits.append(None)
+            return splits
+        def compute():
+            if self.store is not None:
+                with stage(f'split deployments around {len(dates)} events in the store'):
+                    return self._report_store().event_split_stats(dates, window)
+            deployments = self.deployments
+            with stage(f'split deployments around {len(dates)} events', rows=len(deployments)):
+                return event_split_stats(deployments, dates, window)
+        return self._get(('event_splits', tuple(str(date) for date in dates), str(window)), compute)
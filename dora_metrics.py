@@ -0,0 +1,115 @@
+import numpy as np
+import pandas as pd
+from quantile_sketch import DEFAULT_RELATIVE_ACCURACY, sketch_keys
+
+# Trailing window lengths (days) and lead time quantiles of rolling_dora_metrics()
+DORA_WINDOWS = (7, 30, 90)
+LEAD_TIME_QUANTILES = (0.5, 0.9)
+
+
+def _trailing_sums(daily, window):
+    """Sum over the ``window`` days ending at each day (rows are days), from one running sum"""
+    running = np.cumsum(daily, axis=0)
+    sums = running.copy()
+    sums[window:] -= running[:-window]
+    return sums
+
+
+def _row_quantiles(cumulative, q, keys, gamma):
+    """q-quantile of each row of cumulative bucket counts, like QuantileSketch.quantile() (NaN for empty rows)"""
+    totals = cumulative[:, -1]
+    rank = q * (totals - 1)
+    # First bucket whose cumulative count passes the rank
+    first = (cumulative > rank[:, None]).argmax(axis=1)
+    return np.where(totals > 0, 2 * gamma ** keys[first] / (gamma + 1), np.nan)
+
+
+def _day_numbers(values):
+    """UTC day number of each datetime, and a mask of the values that are not NaT"""
+    days = values.to_numpy(dtype='datetime64[ns]')
+    valid = ~np.isnat(days)
+    return days.astype('datetime64[D]').astype(np.int64), valid
+
+
+def daily_lead_time_totals(df, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+    """Per-day inputs of rolling_dora_from_daily(), from one O(n) bucketing pass over the rows.
+
+    Pipelines (and how many of them completed) are counted on their branch
+    creation day; deployments and their lead times on the day the production
+    deploy finished. Returns the gap-free daily PeriodIndex (UTC) covering
+    both, the pipelines, completed pipelines and deployments of each day, the
+    day x lead time sketch bucket count matrix and the bucket keys of its
+    columns.
+    """
+    created, has_created = _day_numbers(df['branch_creation_datetime'])
+    deployed_day, has_deploy = _day_numbers(df['deploy_prod_job_end_datetime'])
+    lead_times = df['days_elapsed_branch_to_deploy'].to_numpy(dtype=float, na_value=np.nan)
+    with_lead_time = has_deploy & (lead_times > 0)
+
+    known = np.concatenate([created[has_created], deployed_day[has_deploy]])
+    first_day = known.min() if len(known) else 0
+    n_days = int(known.max() - first_day) + 1 if len(known) else 0
+
+    created_position = created[has_created] - first_day
+    pipelines = np.bincount(created_position, minlength=n_days)
+    completed = np.bincount(created_position, weights=has_deploy[has_created], minlength=n_days)
+    deployments = np.bincount(deployed_day[has_deploy] - first_day, minlength=n_days)
+    keys = sketch_keys(lead_times[with_lead_time], relative_accuracy)
+    min_key = keys.min() if len(keys) else 0
+    n_buckets = int(keys.max() - min_key) + 1 if len(keys) else 1
+    buckets = np.bincount((deployed_day[with_lead_time] - first_day) * n_buckets + (keys - min_key),
+                          minlength=n_days * n_buckets).reshape(n_days, n_buckets)
+    days = pd.PeriodIndex.from_ordinals(first_day + np.arange(n_days), freq='D')
+    return days, pipelines, completed, deployments, buckets, np.arange(min_key, min_key + n_buckets)
+
+
+def rolling_dora_from_daily(days, pipelines, completed, deployments, buckets, bucket_keys, windows=DORA_WINDOWS,
+                            quantiles=LEAD_TIME_QUANTILES, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+    """rolling_dora_metrics() from per-day totals (see daily_lead_time_totals()).
+
+    Every window slides over the daily totals as the difference of two running
+    sums, so no window is ever recomputed from the rows.
+    """
+    gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+    metrics = {'day': days}
+    for window in windows:
+        window_pipelines = _trailing_sums(pipelines, window)
+        window_completed = _trailing_sums(completed, window)
+        # Windows that start before the first day only cover the days since then
+        covered_days = np.minimum(np.arange(1, len(days) + 1), window)
+        metrics[f'deployment_frequency_{window}d'] = _trailing_sums(deployments, window) / covered_days
+        cumulative = np.cumsum(_trailing_sums(buckets, window), axis=1)
+        for q in quantiles:
+            metrics[f'lead_time_p{round(q * 100)}_{window}d'] = _row_quantiles(cumulative, q, bucket_keys, gamma)
+        metrics[f'change_failure_rate_{window}d'] = np.divide(
+            window_pipelines - window_completed, window_pipelines,
+            out=np.full(len(days), np.nan), where=window_pipelines > 0)
+    return pd.DataFrame(metrics)
+
+
+def rolling_dora_metrics(df, windows=DORA_WINDOWS, quantiles=LEAD_TIME_QUANTILES,
+                         relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+    """DORA metrics over trailing windows of ``windows`` days, at every day.
+
+    Days are UTC. For each window length ``w`` the columns are:
+
+    - ``deployment_frequency_{w}d``: production deploys per day, counted on
+      the day each deploy finished (``deploy_prod_job_end_datetime``), over
+      the days the window covers
+    - ``lead_time_p50_{w}d``, ``lead_time_p90_{w}d`` (one per quantile):
+      days from branch creation to deployment of the deploys finished in the
+      window, within ``relative_accuracy``
+    - ``change_failure_rate_{w}d``: share of the pipelines created in the
+      window (branch creation day, like the monthly stats) that did not
+      complete
+
+    Rows are bucketed by day once (pipeline counts, completions and lead time
+    sketch buckets, O(n)), then every window slides over the daily totals as
+    the difference of two running sums, so no window is ever recomputed from
+    the rows. Windows are truncated before the first day (the frequency
+    divides by the days they do cover); metrics without any pipeline (or
+    deployment) in the window are NaN. Returns one row per day from the first
+    branch creation to the last deploy, gaps included, keyed by ``day``.
+    """
+    return rolling_dora_from_daily(*daily_lead_time_totals(df, relative_accuracy), windows, quantiles,
+                                   relative_accuracy)
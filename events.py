@@ -0,0 +1,56 @@
+import os
+import json
+
+# Optional events config in the data directory, see load_events()
+EVENTS_JSON = 'events.json'
+
+AUTODEPLOY_EVENT = 'autodeploy'
+FEATURE_ENVS_EVENT = 'feature_envs'
+
+# Used when the data directory has no events.json
+DEFAULT_EVENT_CONFIG = {
+    'window_days': None,
+    'events': [
+        {'name': FEATURE_ENVS_EVENT, 'label': 'Feature environments introduced', 'date': '2023-09-01T00:00:00Z'},
+        {'name': AUTODEPLOY_EVENT, 'label': 'Auto-deploy enabled', 'date': '2023-12-12T14:13:04.057Z'}
+    ]
+}
+
+
+def _utc(value):
+    import pandas as pd
+    timestamp = pd.Timestamp(value)
+    return timestamp.tz_localize('UTC') if timestamp.tz is None else timestamp.tz_convert('UTC')
+
+
+def load_events(path=EVENTS_JSON):
+    """Transformation events the report measures before/after, sorted by date.
+
+    ``path`` is a JSON file like DEFAULT_EVENT_CONFIG: a list of events with a
+    unique ``name``, a display ``label`` and an ISO 8601 ``date`` (UTC when no
+    offset is given), plus an optional ``window_days`` limiting both sides of
+    every event to that many days (null compares the whole history). The
+    defaults are used when the file does not exist. The auto-deploy event is
+    required, the dashboard is built around it.
+    """
+    config = DEFAULT_EVENT_CONFIG
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            config = json.load(f)
+
+    events = []
+    for event in config.get('events', []):
+        if 'name' not in event or 'date' not in event:
+            raise ValueError(f"{path}: every event needs a 'name' and a 'date', got {event}")
+        events.append({'name': event['name'], 'label': event.get('label', event['name']), 'date': _utc(event['date'])})
+    names = [event['name'] for event in events]
+    if len(set(names)) != len(names):
+        raise ValueError(f"{path}: event names must be unique, got {names}")
+    if AUTODEPLOY_EVENT not in names:
+        raise ValueError(f"{path}: the '{AUTODEPLOY_EVENT}' event is required")
+    return {'window_days': config.get('window_days'), 'events': sorted(events, key=lambda event: event['date'])}
+
+
+def event_date(config, name):
+    """UTC timestamp of the named event, None when the config has no such event"""
+    return next((event['date'] for event in config['events'] if event['name'] == name), None)
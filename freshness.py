@@ -0,0 +1,59 @@
+import os
+import json
+import hashlib
+
+# Stamp written next to the columnar cache after every successful run
+DEFAULT_STAMP_PATH = os.path.join('.report_cache', 'last_run.json')
+
+# Modules and page templates the outputs are built with (this directory)
+CODE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+
+def _signature(path):
+    """(size, mtime_ns) of a file, None if it does not exist"""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return [stat.st_size, stat.st_mtime_ns]
+
+
+def code_signature(code_dir=CODE_DIR):
+    """SHA-256 of the modules and templates in ``code_dir``, so an upgrade invalidates the last outputs"""
+    digest = hashlib.sha256()
+    for name in sorted(os.listdir(code_dir)):
+        if name.endswith('.py') or name.endswith('_template.html'):
+            with open(os.path.join(code_dir, name), 'rb') as f:
+                digest.update(name.encode() + b'\0' + f.read())
+    return digest.hexdigest()
+
+
+def run_signature(input_paths, options, code_dir=CODE_DIR):
+    """What a run depends on: the input file signatures, the options and the code that shape the output"""
+    return {
+        'options': options,
+        'inputs': {path: _signature(path) for path in input_paths},
+        'code': code_signature(code_dir)
+    }
+
+
+def is_fresh(signature, output_paths, stamp_path=DEFAULT_STAMP_PATH):
+    """True when the last run used the same inputs and options and its outputs are untouched.
+
+    Uses only os.stat and the stamp file, so it can run before pandas is imported.
+    """
+    try:
+        with open(stamp_path, 'r') as f:
+            stamp = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return False
+    outputs = {path: _signature(path) for path in output_paths}
+    return (stamp.get('run') == signature and stamp.get('outputs') == outputs
+            and all(value is not None for value in outputs.values()))
+
+
+def write_stamp(signature, output_paths, stamp_path=DEFAULT_STAMP_PATH):
+    """Record the signature a run started from, and the outputs it wrote"""
+    os.makedirs(os.path.dirname(stamp_path) or '.', exist_ok=True)
+    with open(stamp_path, 'w') as f:
+        json.dump({'run': signature, 'outputs': {path: _signature(path) for path in output_paths}}, f, indent=2)
@@ -0,0 +1,192 @@
+import io
+import os
+import json
+import shutil
+import hashlib
+import pandas as pd
+from aggregation import SKETCH_COLUMN, deployment_period_stats
+from cache import _pyarrow_feather
+from quantile_sketch import QuantileSketch
+from schema import SCHEMAS, read_csv_with_schema
+
+# Per-period deployment stats of an append-only export, kept current across runs.
+# The export is only ever re-read from the byte offset where the last run stopped:
+# new rows are parsed on their own and only the periods they fall in are recomputed
+# from the rows kept for them, every other period is reused as stored.
+
+STATE_VERSION = 2
+
+# Columns deployment_period_stats() reads, kept per period for recomputation
+STAT_SOURCE_COLUMNS = [
+    'branch_creation_datetime',
+    'deploy_prod_job_end_datetime',
+    'days_elapsed_branch_to_deploy',
+    'deploy_prod_job_trigger'
+]
+
+DEPLOYMENTS_SCHEMA = SCHEMAS['deploy_prod_pipelines_2022_2025_argocd_refined.csv']
+
+
+def _state_paths(source_path, state_dir, freq):
+    name = os.path.basename(source_path)
+    return (os.path.join(state_dir, f'{name}.period_stats_{freq}.json'),
+            os.path.join(state_dir, f'{name}.period_rows_{freq}'))
+
+
+def _load_state(state_file, freq, key, sketch_accuracy):
+    try:
+        with open(state_file, 'r') as f:
+            state = json.load(f)
+    except (OSError, ValueError):
+        return None
+    if (state.get('version') != STATE_VERSION or state.get('freq') != freq or state.get('key') != key
+            or state.get('sketch_accuracy') != sketch_accuracy
+            or state.get('schema') != json.dumps(DEPLOYMENTS_SCHEMA, sort_keys=True)):
+        return None
+    return state
+
+
+def _save_state(state_file, state, stats, key):
+    serialized = stats.assign(
+        **{key: stats[key].astype(str)},
+        first_branch_creation=stats['first_branch_creation'].map(lambda ts: ts.isoformat())
+    )
+    if SKETCH_COLUMN in serialized:
+        serialized[SKETCH_COLUMN] = serialized[SKETCH_COLUMN].map(lambda sketch: sketch.to_dict())
+    state['columns'] = list(stats.columns)
+    state['dtypes'] = {column: str(dtype) for column, dtype in stats.dtypes.items() if column != key}
+    state['periods'] = serialized.to_dict(orient='records')
+    with open(state_file, 'w') as f:
+        json.dump(state, f)
+
+
+def _stored_stats(state, freq, key):
+    """The stats DataFrame saved by _save_state(), with its original dtypes"""
+    stats = pd.DataFrame(state['periods'], columns=state['columns'])
+    stats[key] = pd.PeriodIndex(stats[key], freq=freq)
+    stats['first_branch_creation'] = pd.to_datetime(stats['first_branch_creation'], format='ISO8601')
+    if SKETCH_COLUMN in stats:
+        stats[SKETCH_COLUMN] = stats[SKETCH_COLUMN].map(QuantileSketch.from_dict)
+    return stats.astype(state['dtypes'])
+
+
+def _period_rows_path(rows_dir, period):
+    # Ordinals keep week periods ('2024-01-01/2024-01-07') out of the file names
+    return os.path.join(rows_dir, f'{period.ordinal}.feather')
+
+
+def _file_digest(f, length, chunk_size=1024 * 1024):
+    """SHA-256 of the next ``length`` bytes of an open file"""
+    digest = hashlib.sha256()
+    while length > 0:
+        chunk = f.read(min(chunk_size, length))
+        if not chunk:
+            break
+        digest.update(chunk)
+        length -= len(chunk)
+    return digest
+
+
+def _rebuild(source_path, state_file, rows_dir, freq, key, sketch_accuracy, load_rows, feather):
+    """Full deployment_period_stats() of the export, saved with the rows of every period"""
+    stat = os.stat(source_path)
+    with open(source_path, 'rb') as f:
+        header = f.readline()
+        f.seek(0)
+        digest = _file_digest(f, stat.st_size)
+        f.seek(max(stat.st_size - 1, 0))
+        complete = f.read(1) in (b'\n', b'')
+    df = load_rows() if load_rows is not None else read_csv_with_schema(source_path, DEPLOYMENTS_SCHEMA)[0]
+    stats = deployment_period_stats(df, freq, key, sketch_accuracy)
+
+    after = os.stat(source_path)
+    if feather is None or (after.st_size, after.st_mtime_ns) != (stat.st_size, stat.st_mtime_ns):
+        # Rewritten while it was read: the rows may not match the digest, keep no state
+        return stats
+    shutil.rmtree(rows_dir, ignore_errors=True)
+    os.makedirs(rows_dir)
+    rows = df[STAT_SOURCE_COLUMNS]
+    period = rows['branch_creation_datetime'].dt.to_period(freq)
+    for value, period_rows in rows.groupby(period, sort=False):
+        feather.write_feather(period_rows.reset_index(drop=True), _period_rows_path(rows_dir, value),
+                              compression='uncompressed')
+    _save_state(state_file, {
+        'version': STATE_VERSION,
+        'freq': freq,
+        'key': key,
+        'sketch_accuracy': sketch_accuracy,
+        'schema': json.dumps(DEPLOYMENTS_SCHEMA, sort_keys=True),
+        'header': header.decode(),
+        'size': stat.st_size,
+        'mtime_ns': stat.st_mtime_ns,
+        'offset': stat.st_size,
+        'complete': complete,
+        'sha256': digest.hexdigest()
+    }, stats, key)
+    return stats
+
+
+def incremental_period_stats(source_path, state_dir, freq='M', key='year_month', sketch_accuracy=None,
+                             load_rows=None):
+    """deployment_period_stats() of an append-only export, recomputing only the periods new rows fall in.
+
+    The stats of every period, the rows of every period (the columns the
+    stats read, as Feather files) and the SHA-256 of the export as far as it
+    was read are kept under ``state_dir``. An export with the same size and
+    mtime is not read at all. One that only grew, with the bytes read last
+    time unchanged, has just its appended lines parsed: the periods they fall
+    in are recomputed from their stored rows plus the new ones, the others are
+    reused. Each period's stats depend only on its own rows in file order, so
+    the result is identical to deployment_period_stats() on the whole export.
+
+    Anything else (first run, rewritten rows, other schema or options) rebuilds
+    the state from ``load_rows()``, which returns the whole parsed export
+    (read from ``source_path`` when omitted). Without pyarrow nothing is kept
+    and every call is a full rebuild.
+    """
+    state_file, rows_dir = _state_paths(source_path, state_dir, freq)
+    feather = _pyarrow_feather()
+    state = _load_state(state_file, freq, key, sketch_accuracy) if feather is not None else None
+    if feather is not None:
+        os.makedirs(state_dir, exist_ok=True)
+
+    def rebuild():
+        return _rebuild(source_path, state_file, rows_dir, freq, key, sketch_accuracy, load_rows, feather)
+
+    if state is None:
+        return rebuild()
+
+    stat = os.stat(source_path)
+    if (stat.st_size, stat.st_mtime_ns) == (state['size'], state['mtime_ns']):
+        return _stored_stats(state, freq, key)
+    if stat.st_size < state['offset'] or not state['complete']:
+        return rebuild()
+    with open(source_path, 'rb') as f:
+        digest = _file_digest(f, state['offset'])
+        if digest.hexdigest() != state['sha256']:
+            return rebuild()
+        tail = f.read(stat.st_size - state['offset'])
+    digest.update(tail)
+
+    stats = _stored_stats(state, freq, key)
+    if tail.strip():
+        new_rows, _ = read_csv_with_schema(io.BytesIO(state['header'].encode() + tail), DEPLOYMENTS_SCHEMA)
+        new_rows = new_rows[STAT_SOURCE_COLUMNS]
+        period = new_rows['branch_creation_datetime'].dt.to_period(freq)
+        changed = []
+        for value, period_rows in new_rows.groupby(period, sort=False):
+            path = _period_rows_path(rows_dir, value)
+            if os.path.exists(path):
+                period_rows = pd.concat([feather.read_feather(path), period_rows], ignore_index=True)
+            feather.write_feather(period_rows, path, compression='uncompressed')
+            changed.append(period_rows)
+        if changed:
+            fresh = deployment_period_stats(pd.concat(changed, ignore_index=True), freq, key, sketch_accuracy)
+            fresh = fresh.astype(stats.dtypes.to_dict())
+            stats = pd.concat([stats[~stats[key].isin(fresh[key])], fresh], ignore_index=True)
+            stats = stats.sort_values(key, ignore_index=True)
+
+    state.update(size=stat.st_size, mtime_ns=stat.st_mtime_ns, offset=stat.st_size,
+                 complete=tail.endswith(b'\n') or not tail, sha256=digest.hexdigest())
+    _save_state(state_file, state, stats, key)
+    return stats
@@ -0,0 +1,100 @@
+import sys
+import json
+import time
+import importlib
+import threading
+from contextlib import contextmanager
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+
+def _peak_rss_mb():
+    """Peak resident set size of this process so far, in MB (None where unavailable)"""
+    if resource is None:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+class StageProfiler:
+    """Wall time, CPU time, peak RSS and row counts per named stage.
+
+    Stages are listed in the order they start, nested stages included (with
+    their depth), so the cost of a run can be attributed to reading, parsing,
+    aggregating, calculating or rendering. Every finished stage is also passed
+    to the registered hooks, e.g. to forward timings to a metrics collector.
+    Records and nesting depth are kept per thread, so concurrent runs (e.g.
+    the dashboard server's request threads) never reset or nest into each
+    other; the hooks are shared.
+    """
+
+    def __init__(self):
+        self.hooks = []
+        self._local = threading.local()
+
+    @property
+    def records(self):
+        """Stages started by the current thread since its last reset()"""
+        if not hasattr(self._local, 'records'):
+            self._local.records = []
+        return self._local.records
+
+    def add_hook(self, hook):
+        """Call hook(record) for every finished stage"""
+        self.hooks.append(hook)
+        return hook
+
+    def reset(self):
+        self._local.records = []
+
+    @contextmanager
+    def stage(self, name, rows=None):
+        """Time the enclosed block; set record['rows'] inside it if the count is known only then"""
+        depth = getattr(self._local, 'depth', 0)
+        record = {'stage': name, 'depth': depth, 'rows': rows}
+        self.records.append(record)
+        self._local.depth = depth + 1
+        wall_started, cpu_started = time.perf_counter(), time.process_time()
+        try:
+            yield record
+        finally:
+            self._local.depth = depth
+            record['wall_seconds'] = round(time.perf_counter() - wall_started, 6)
+            record['cpu_seconds'] = round(time.process_time() - cpu_started, 6)
+            record['peak_rss_mb'] = _peak_rss_mb()
+            for hook in self.hooks:
+                hook(record)
+
+    def print_report(self):
+        """Print one line per stage, nested stages indented"""
+        print()
+        print("⏱️  STAGE PROFILE")
+        print("=" * 92)
+        print(f"   {'Stage':<52} {'Wall (s)':>9} {'CPU (s)':>9} {'Peak RSS':>10} {'Rows':>9}")
+        for record in self.records:
+            name = '  ' * record['depth'] + record['stage']
+            rss = f"{record['peak_rss_mb']:.0f} MB" if record['peak_rss_mb'] is not None else "-"
+            rows = f"{record['rows']:,}" if record['rows'] is not None else ""
+            print(f"   {name[:52]:<52} {record['wall_seconds']:>9.3f} {record['cpu_seconds']:>9.3f} {rss:>10} {rows:>9}")
+
+    def write_json(self, path):
+        """Write the stages in start order as JSON"""
+        with open(path, 'w') as f:
+            json.dump({'stages': self.records}, f, indent=4)
+
+
+def load_hook(spec):
+    """Import a hook given as 'module:function'"""
+    module_name, _, function_name = spec.partition(':')
+    if not function_name:
+        raise ValueError(f"Profile hook must look like module:function, got '{spec}'")
+    return getattr(importlib.import_module(module_name), function_name)
+
+
+# Process-wide profiler used by the loaders, the calculator and the renderer
+profiler = StageProfiler()
+stage = profiler.stage
@@ -0,0 +1,111 @@
+import math
+import numpy as np
+import pandas as pd
+
+DEFAULT_RELATIVE_ACCURACY = 0.01
+
+
+def sketch_keys(values, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+    """Logarithmic bucket index of each positive value (vectorized)"""
+    gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+    return np.ceil(np.log(np.asarray(values, dtype=float)) / math.log(gamma)).astype(np.int64)
+
+
+class QuantileSketch:
+    """Mergeable quantile sketch for positive values (DDSketch style).
+
+    Values are counted in logarithmic buckets, so any quantile is returned
+    within ``relative_accuracy`` of the true value whatever the data size.
+    Two sketches with the same accuracy merge by adding bucket counts, which
+    makes them safe to build per chunk, per worker or per period and combine
+    later.
+    """
+
+    def __init__(self, relative_accuracy=DEFAULT_RELATIVE_ACCURACY, counts=None):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        # bucket key -> number of values
+        self.counts = pd.Series(counts if counts is not None else {}, dtype='int64')
+
+    @property
+    def count(self):
+        return int(self.counts.sum())
+
+    def add(self, values):
+        """Add positive values to the sketch"""
+        values = np.asarray(values, dtype=float)
+        if len(values):
+            keys, counts = np.unique(sketch_keys(values, self.relative_accuracy), return_counts=True)
+            self.add_counts(pd.Series(counts, index=keys))
+        return self
+
+    def add_counts(self, counts):
+        """Add pre-bucketed counts (a Series indexed by bucket key)"""
+        self.counts = self.counts.add(counts, fill_value=0).astype('int64')
+        return self
+
+    def merge(self, other):
+        """Merge another sketch built with the same relative accuracy"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        return self.add_counts(other.counts)
+
+    def quantile(self, q):
+        """Approximate q-quantile (0 <= q <= 1), NaN for an empty sketch"""
+        if self.counts.empty:
+            return float('nan')
+        counts = self.counts.sort_index()
+        rank = q * (counts.sum() - 1)
+        key = counts.index[np.searchsorted(counts.cumsum().to_numpy(), rank, side='right')]
+        return 2 * self.gamma ** key / (self.gamma + 1)
+
+    def to_dict(self):
+        """JSON-serializable form, see from_dict()"""
+        return {
+            'relative_accuracy': self.relative_accuracy,
+            'counts': {str(key): int(count) for key, count in self.counts.items()}
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        """Rebuild a sketch stored with to_dict()"""
+        counts = {int(key): count for key, count in data['counts'].items()}
+        return cls(data['relative_accuracy'], counts)
+
+
+def period_bucket_counts(values, period, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+    """Sketch bucket counts of the positive, non-null values as one (period, bucket) -> count Series.
+
+    This is every period's sketch in flat columns: sketches of coarser periods
+    are a groupby-sum of it, with no per-period objects (see bucket_quantiles()).
+    """
+    valid = values.notna() & (values > 0) & period.notna()
+    keys = pd.Series(sketch_keys(values[valid], relative_accuracy), index=values.index[valid], name='bucket')
+    return keys.groupby([period[valid], keys]).size()
+
+
+def bucket_quantiles(counts, q, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+    """Approximate q-quantile of every period in a period_bucket_counts() Series, as QuantileSketch.quantile()"""
+    gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+    counts = counts.sort_index()
+    by_period = counts.groupby(level=0, sort=False)
+    rank = q * (by_period.transform('sum') - 1)
+    # First bucket of each period whose cumulative count passes the rank
+    reached = counts[by_period.cumsum() > rank]
+    first = reached.groupby(level=0, sort=False).head(1).index
+    keys = first.get_level_values(1).to_numpy()
+    return pd.Series(2 * gamma ** keys / (gamma + 1), index=first.get_level_values(0))
+
+
+def period_sketches(values, period, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+    """One sketch per period for the positive, non-null values (vectorized bucketing)"""
+    counts = period_bucket_counts(values, period, relative_accuracy)
+    return {p: QuantileSketch(relative_accuracy, group.droplevel(0)) for p, group in counts.groupby(level=0)}
+
+
+def merge_sketches(sketches, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+    """Merge an iterable of sketches into a new one"""
+    merged = QuantileSketch(relative_accuracy)
+    for sketch in sketches:
+        merged.merge(sketch)
+    return merged
@@ -0,0 +1,78 @@
+import pandas as pd
+from profiling import stage
+
+# Declared schema for every CSV input: column dtypes plus datetime columns with
+# their expected format and timezone ('UTC' converts to UTC, None keeps the
+# values as exported). Columns that are not listed are read as inferred.
+SCHEMAS = {
+    'deploy_prod_pipelines_2022_2025_argocd_refined.csv': {
+        'dtypes': {
+            'pipeline_id': 'Int64',
+            'branch_name': 'str',
+            'days_elapsed_branch_to_deploy': 'float64',
+            'deploy_prod_job_trigger': 'category'
+        },
+        'datetimes': {
+            'branch_creation_datetime': {'format': 'ISO8601', 'tz': 'UTC'},
+            'deploy_prod_job_end_datetime': {'format': 'ISO8601', 'tz': 'UTC'}
+        }
+    },
+    'coverage_data_unit_tests.csv': {
+        'dtypes': {'code_coverage': 'float64'},
+        'datetimes': {'commit_date': {'format': 'ISO8601', 'tz': None}}
+    },
+    'coverage_e2e_tests_count.csv': {
+        'dtypes': {'number_of_tests': 'int64'},
+        'datetimes': {'commit_date': {'format': 'ISO8601', 'tz': None}}
+    },
+    'ec2_costs_us_east_1.csv': {
+        'dtypes': {'ec2_cost_usd': 'float64'},
+        'datetimes': {'commit_date': {'format': 'ISO8601', 'tz': None}}
+    },
+    'feature_environments_created_count.csv': {
+        'dtypes': {'month': 'str', 'count': 'int64'},
+        'datetimes': {}
+    },
+    # No column is used by the report yet; store.py keys the rows on month
+    'pipeline_success_failure_correlation.csv': {
+        'dtypes': {'month': 'str'},
+        'datetimes': {}
+    }
+}
+
+
+def parse_datetime_column(values, format='ISO8601', tz=None):
+    """Parse a datetime column with a strict fast path and a per-row fallback.
+
+    The whole column is first parsed with the declared format, which is
+    vectorized. Only rows that fail it are re-parsed one by one with
+    format='mixed'; values that are not dates at all (e.g. 'pending') become
+    NaT. Returns the parsed Series and the number of rows that needed the
+    fallback, those NaT rows included.
+    """
+    utc = tz == 'UTC'
+    parsed = pd.to_datetime(values, utc=utc, format=format, errors='coerce')
+    failed = parsed.isna() & values.notna()
+    fallback_rows = int(failed.sum())
+    if fallback_rows and fallback_rows == values.notna().sum():
+        # Nothing matched the declared format, parse the column as before
+        return pd.to_datetime(values, utc=utc, format='mixed', errors='coerce'), fallback_rows
+    if fallback_rows:
+        fallback = pd.to_datetime(values[failed], utc=utc, format='mixed', errors='coerce')
+        parsed[failed] = fallback.astype(parsed.dtype)
+    return parsed, fallback_rows
+
+
+def read_csv_with_schema(path, schema):
+    """Read a CSV with its declared dtypes and parse its datetime columns.
+
+    Returns the DataFrame and a dict of fallback row counts per datetime column.
+    """
+    with stage('read CSV') as record:
+        df = pd.read_csv(path, dtype=schema['dtypes'])
+        record['rows'] = len(df)
+    fallbacks = {}
+    with stage('parse datetimes', rows=len(df)):
+        for column, spec in schema['datetimes'].items():
+            df[column], fallbacks[column] = parse_datetime_column(df[column], spec['format'], spec['tz'])
+    return df, fallbacks
@@ -0,0 +1,79 @@
+import itertools
+import numpy as np
+import pandas as pd
+from cost_savings_calculator import DevOpsCostSavingsCalculator
+
+DEFAULT_PERCENTILES = (5, 25, 50, 75, 95)
+
+
+def parameter_grid(ranges):
+    """Cartesian product of assumption values, e.g. {'dev_hourly_rate': [40, 50, 60]}"""
+    names = list(ranges)
+    combinations = list(itertools.product(*(np.asarray(ranges[name]).tolist() for name in names)))
+    values = np.array(combinations, dtype=float).reshape(len(combinations), len(names))
+    return {name: values[:, i] for i, name in enumerate(names)}
+
+
+def monte_carlo_samples(bounds, n, seed=None):
+    """Uniform random assumption values, e.g. {'dev_hourly_rate': (40, 80)}"""
+    rng = np.random.default_rng(seed)
+    return {name: rng.uniform(low, high, n) for name, (low, high) in bounds.items()}
+
+
+def sweep_savings(scenarios, calculator=None, percentiles=DEFAULT_PERCENTILES, chunk_size=20000):
+    """Evaluate the savings model for many assumption scenarios at once.
+
+    ``scenarios`` maps assumption names (see DevOpsCostSavingsCalculator.ASSUMPTIONS)
+    to equally long arrays, as returned by parameter_grid() or
+    monte_carlo_samples(); unlisted assumptions keep the calculator's values.
+    The monthly stats are aggregated once, then every scenario is evaluated as
+    one (scenarios, months) NumPy matrix per chunk.
+
+    Returns a dict with:
+        'scenarios': one row per scenario with its assumptions, total net
+            savings and total calendar days saved
+        'monthly_bands': net savings percentiles per month
+        'total_bands': total net savings percentiles
+    """
+    if calculator is None:
+        calculator = DevOpsCostSavingsCalculator()
+    unknown = set(scenarios) - set(calculator.ASSUMPTIONS)
+    if unknown:
+        raise ValueError(f"Unknown assumptions: {', '.join(sorted(unknown))}")
+
+    scenarios = {name: np.asarray(values, dtype=float) for name, values in scenarios.items()}
+    n_scenarios = len(next(iter(scenarios.values()))) if scenarios else 1
+
+    monthly_stats = calculator.monthly_inputs(None, calculator.data.ec2_costs, calculator.data.deployment_stats('M'))
+    is_post = monthly_stats['is_post_autodeploy'].to_numpy()
+    n_months = len(monthly_stats)
+
+    net_savings = np.empty((n_scenarios, n_months))
+    time_saved_days = np.empty(n_scenarios)
+    for start in range(0, n_scenarios, chunk_size):
+        stop = min(start + chunk_size, n_scenarios)
+        chunk = {name: values[start:stop, np.newaxis] for name, values in scenarios.items()}
+        components = calculator.savings_components(monthly_stats, chunk)
+        net_savings[start:stop] = components['net_savings']
+        time_saved_days[start:stop] = np.broadcast_to(
+            components['time_saved_days'], (stop - start, n_months)).sum(axis=1)
+
+    total_net_savings = net_savings[:, is_post].sum(axis=1)
+
+    results = pd.DataFrame(scenarios if scenarios else {}, index=range(n_scenarios))
+    results['total_net_savings'] = total_net_savings
+    results['total_time_saved_calendar_days'] = time_saved_days
+
+    band_labels = [f'p{p:g}' for p in percentiles]
+    monthly_bands = pd.DataFrame(
+        np.percentile(net_savings, percentiles, axis=0).T,
+        index=monthly_stats['year_month'].astype(str).rename('month'),
+        columns=band_labels
+    )
+    total_bands = pd.Series(np.percentile(total_net_savings, percentiles), index=band_labels)
+
+    return {
+        'scenarios': results,
+        'monthly_bands': monthly_bands,
+        'total_bands': total_bands
+    }
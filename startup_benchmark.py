@@ -0,0 +1,82 @@
+import os
+import sys
+import time
+import argparse
+import statistics
+import subprocess
+
+SCRIPT = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'create_devops_impact_report.py')
+
+# Modules the fast paths must never import
+HEAVY_MODULES = ('pandas', 'numpy', 'pyarrow')
+
+# Command lines whose startup is guarded, all expected to exit without loading data
+FAST_PATHS = {
+    'help': ['--help'],
+    'up-to-date': []
+}
+
+
+def _run(args, data_dir, env_options=()):
+    return subprocess.run([sys.executable, *env_options, SCRIPT, *args], cwd=data_dir,
+                          capture_output=True, text=True)
+
+
+def heavy_imports(args, data_dir):
+    """Heavy modules imported by one run, from python -X importtime"""
+    result = _run(args, data_dir, ('-X', 'importtime'))
+    imported = {line.rsplit('|', 1)[-1].strip() for line in result.stderr.splitlines() if line.startswith('import time:')}
+    return sorted(imported & set(HEAVY_MODULES))
+
+
+def time_startup(args, data_dir, runs):
+    """Median wall time in milliseconds of `runs` fresh interpreter runs"""
+    timings = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        _run(args, data_dir)
+        timings.append((time.perf_counter() - started) * 1000)
+    return statistics.median(timings)
+
+
+def main(data_dir, runs, max_ms):
+    """Benchmark the CLI fast paths; returns False if any is over budget or imports a heavy module"""
+    # Make sure the last run's outputs are current so the no-op path is taken
+    _run([], data_dir)
+
+    # Python's own startup, for reference
+    interpreter = []
+    for _ in range(runs):
+        started = time.perf_counter()
+        subprocess.run([sys.executable, '-c', 'pass'])
+        interpreter.append((time.perf_counter() - started) * 1000)
+    baseline_ms = statistics.median(interpreter)
+
+    print("⏱️  STARTUP BENCHMARK")
+    print("=" * 60)
+    print(f"   {'bare interpreter':<20} {baseline_ms:>8.1f} ms")
+    ok = True
+    for name, args in FAST_PATHS.items():
+        median_ms = time_startup(args, data_dir, runs)
+        heavy = heavy_imports(args, data_dir)
+        passed = median_ms <= max_ms and not heavy
+        ok = ok and passed
+        icon = "✅" if passed else "❌"
+        note = f"  imports {', '.join(heavy)}" if heavy else ""
+        print(f"{icon} {name:<20} {median_ms:>8.1f} ms{note}")
+    print(f"   Budget: {max_ms:.0f} ms per run, no {'/'.join(HEAVY_MODULES)} imports")
+    return ok
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Guard the dashboard CLI startup time against regressions")
+    parser.add_argument('data_dir', nargs='?', default='.', help="Directory with the report inputs")
+    parser.add_argument('--runs', type=int, default=10, help="Runs per command (the median is reported)")
+    parser.add_argument('--max-ms', type=float, default=250,
+                        help="Fail if a fast path takes longer than this many milliseconds")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    sys.exit(0 if main(args.data_dir, args.runs, args.max_ms) else 1)
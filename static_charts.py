@@ -0,0 +1,292 @@
+import os
+import math
+import time
+from html import escape
+
+STATIC_REPORT_FILENAME = 'static_report.html'
+STATIC_FORMATS = ('svg', 'png')
+
+WIDTH = 800
+HEIGHT = 400
+# Plot area margins (left, right, top, bottom)
+MARGINS = (70, 70, 60, 70)
+MAX_X_LABELS = 12
+MAX_POINTS_WITH_MARKERS = 100
+
+
+def _auto_deploy_marker(dashboard_data):
+    return {
+        'index': dashboard_data['timeline']['autodeploy_index'], 'color': 'rgb(54, 162, 235)', 'dash': '5,5',
+        'text': ('Auto-Deploy', 'Enabled'), 'anchor': 'top', 'offset': 20
+    }
+
+
+def _feature_envs_marker(dashboard_data, offset):
+    return {
+        'index': dashboard_data['timeline']['feature_envs_start_index'], 'color': 'rgb(34, 197, 94)', 'dash': '3,3',
+        'text': ('Feature Envs', 'Introduced'), 'anchor': 'bottom', 'offset': offset
+    }
+
+
+def _series(label, values, color, fill=False, axis='y'):
+    return {'label': label, 'values': values, 'color': color, 'fill': fill, 'axis': axis}
+
+
+def chart_specs(dashboard_data):
+    """The six dashboard charts as plain data: labels, series, axes and marker lines"""
+    # Every series is aligned on the shared time axis
+    labels = dashboard_data['timeline']['months']
+    auto_deploy_marker = _auto_deploy_marker(dashboard_data)
+    monthly = dashboard_data['monthly_data']
+    tests = dashboard_data['test_data']
+    ec2 = dashboard_data['ec2_data']
+    feature_envs = dashboard_data['feature_envs_data']
+    pipeline = dashboard_data['pipeline_data']
+    return [
+        {
+            'id': 'completionChart', 'title': 'Deployments success rates', 'labels': labels,
+            'series': [_series('Completion Rate (%)', monthly['completion_rates'], 'rgb(75, 192, 192)', fill=True)],
+            'axes': {'y': {'title': 'Completion Rate (%)', 'min': 0, 'max': 100}},
+            'markers': [auto_deploy_marker]
+        },
+        {
+            'id': 'deploymentChart', 'title': 'Monthly Deployment Time Trend', 'labels': labels,
+            'series': [_series('Average Deployment Time (days)', monthly['avg_deployment_days'], 'rgb(255, 99, 132)',
+                               fill=True)],
+            'axes': {'y': {'title': 'Days', 'min': 0}},
+            'markers': [auto_deploy_marker]
+        },
+        {
+            'id': 'testChart', 'title': 'Test Coverage & E2E Tests Trend', 'labels': labels,
+            'series': [
+                _series('Unit Test Coverage (%)', tests['coverage_percentages'], 'rgb(54, 162, 235)'),
+                _series('Web E2E Tests (#)', tests['e2e_counts'], 'rgb(255, 159, 64)', axis='y1')
+            ],
+            'axes': {'y': {'title': 'Coverage (%)', 'min': 50, 'max': 100},
+                     'y1': {'title': 'Number of E2E Tests', 'min': 0}},
+            'markers': [auto_deploy_marker]
+        },
+        {
+            'id': 'ec2Chart', 'title': 'AWS EC2 Costs for feature environments', 'labels': labels,
+            'series': [_series('EC2 Costs (USD)', ec2['costs'], 'rgb(34, 197, 94)', fill=True)],
+            'axes': {'y': {'title': 'Cost (USD)', 'min': 0}},
+            'markers': [_feature_envs_marker(dashboard_data, -75), auto_deploy_marker]
+        },
+        {
+            'id': 'featureEnvsChart', 'title': 'Feature Environments Created Over Time', 'labels': labels,
+            'series': [_series('Feature Environments Created', feature_envs['counts'], 'rgb(147, 51, 234)', fill=True)],
+            'axes': {'y': {'title': 'Environments Created', 'min': 0}},
+            'markers': [_feature_envs_marker(dashboard_data, -30), auto_deploy_marker]
+        },
+        {
+            'id': 'pipelineReliabilityChart', 'title': 'Data Pipeline Failures Over Time', 'labels': labels,
+            'series': [_series('Failure Rate (%)', pipeline['failure_rates'], 'rgb(239, 68, 68)', fill=True)],
+            'axes': {'y': {'title': 'Failure Rate (%)', 'min': 0, 'max': 20}},
+            'markers': [auto_deploy_marker]
+        }
+    ]
+
+
+def _nice_step(span, target_ticks=5):
+    """Tick step of 1, 2 or 5 times a power of ten giving about target_ticks intervals"""
+    raw = span / target_ticks
+    magnitude = 10 ** math.floor(math.log10(raw))
+    for factor in (1, 2, 5, 10):
+        if factor * magnitude >= raw:
+            return factor * magnitude
+    return 10 * magnitude
+
+
+def _axis_range(axis, values):
+    """Axis bounds and ticks: fixed min/max where given, otherwise rounded up to a tick"""
+    present = [v for v in values if v is not None]
+    low = axis.get('min', min(present, default=0))
+    high = axis.get('max', max(present, default=low + 1))
+    if high <= low:
+        high = low + 1
+    step = _nice_step(high - low)
+    if 'max' not in axis:
+        high = low + math.ceil((high - low) / step) * step
+    ticks = [low + i * step for i in range(int(round((high - low) / step)) + 1)]
+    return low, high, ticks
+
+
+def _format_tick(value):
+    return f'{value:,.0f}' if float(value).is_integer() else f'{value:g}'
+
+
+def _segments(points):
+    """Split (x, y) points into runs without missing values (Chart.js leaves gaps at nulls)"""
+    runs, run = [], []
+    for point in points:
+        if point[1] is None:
+            if run:
+                runs.append(run)
+            run = []
+        else:
+            run.append(point)
+    if run:
+        runs.append(run)
+    return runs
+
+
+def _fill_color(color):
+    return color.replace('rgb(', 'rgba(').replace(')', ', 0.2)')
+
+
+def render_chart_svg(spec, width=WIDTH, height=HEIGHT):
+    """Draw one chart spec as a standalone SVG document"""
+    left, right, top, bottom = MARGINS
+    plot_left, plot_right = left, width - right
+    plot_top, plot_bottom = top, height - bottom
+    labels = spec['labels']
+    n = len(labels)
+
+    def x_at(i):
+        return plot_left + (plot_right - plot_left) * (i / (n - 1) if n > 1 else 0.5)
+
+    ranges = {
+        name: _axis_range(axis, [v for s in spec['series'] if s['axis'] == name for v in s['values']])
+        for name, axis in spec['axes'].items()
+    }
+
+    def y_at(name, value):
+        low, high, _ = ranges[name]
+        return plot_bottom - (plot_bottom - plot_top) * (value - low) / (high - low)
+
+    out = [
+        f'<svg xmlns="http://www.w3.org/2000/svg" width="{width}" height="{height}" viewBox="0 0 {width} {height}" '
+        f'font-family="Arial, sans-serif" font-size="12">',
+        f'<rect width="{width}" height="{height}" fill="white"/>'
+    ]
+
+    # Legend
+    legend_x = plot_left
+    for series in spec['series']:
+        out.append(f'<rect x="{legend_x}" y="18" width="30" height="12" fill="{_fill_color(series["color"])}" '
+                   f'stroke="{series["color"]}" stroke-width="2"/>')
+        out.append(f'<text x="{legend_x + 36}" y="28" fill="#666">{escape(series["label"])}</text>')
+        legend_x += 50 + 7 * len(series['label'])
+
+    # Y axes: grid and ticks on the left axis, ticks only on the right one
+    for name, axis in spec['axes'].items():
+        _, _, ticks = ranges[name]
+        on_left = name == 'y'
+        tick_x = plot_left - 8 if on_left else plot_right + 8
+        anchor = 'end' if on_left else 'start'
+        for tick in ticks:
+            y = round(y_at(name, tick), 2)
+            if on_left:
+                out.append(f'<line x1="{plot_left}" y1="{y}" x2="{plot_right}" y2="{y}" stroke="#e5e5e5"/>')
+            out.append(f'<text x="{tick_x}" y="{y + 4}" text-anchor="{anchor}" fill="#666">{_format_tick(tick)}</text>')
+        title_x = 18 if on_left else width - 12
+        middle = (plot_top + plot_bottom) / 2
+        out.append(f'<text x="{title_x}" y="{middle}" text-anchor="middle" fill="#666" '
+                   f'transform="rotate(-90 {title_x} {middle})">{escape(axis["title"])}</text>')
+
+    # X axis labels, thinned to at most MAX_X_LABELS
+    every = max(1, math.ceil(n / MAX_X_LABELS))
+    for i in range(0, n, every):
+        x = round(x_at(i), 2)
+        out.append(f'<text x="{x}" y="{plot_bottom + 16}" text-anchor="end" fill="#666" '
+                   f'transform="rotate(-45 {x} {plot_bottom + 16})">{escape(str(labels[i]))}</text>')
+    out.append(f'<text x="{(plot_left + plot_right) / 2}" y="{height - 6}" text-anchor="middle" fill="#666">Month</text>')
+    out.append(f'<line x1="{plot_left}" y1="{plot_bottom}" x2="{plot_right}" y2="{plot_bottom}" stroke="#999"/>')
+
+    # Series: filled area under each run, then the line and its points, clipped to the plot area like Chart.js
+    clip_id = spec['id'] + '-plot'
+    out.append(f'<clipPath id="{clip_id}"><rect x="{plot_left - 5}" y="{plot_top}" '
+               f'width="{plot_right - plot_left + 10}" height="{plot_bottom - plot_top}"/></clipPath>')
+    out.append(f'<g clip-path="url(#{clip_id})">')
+    for series in spec['series']:
+        low = ranges[series['axis']][0]
+        points = [(round(x_at(i), 2), None if v is None else round(y_at(series['axis'], v), 2))
+                  for i, v in enumerate(series['values'][:n])]
+        for run in _segments(points):
+            path = ' '.join(f'{x},{y}' for x, y in run)
+            if series['fill']:
+                base = round(y_at(series['axis'], low), 2)
+                out.append(f'<polygon points="{run[0][0]},{base} {path} {run[-1][0]},{base}" '
+                           f'fill="{_fill_color(series["color"])}"/>')
+            out.append(f'<polyline points="{path}" fill="none" stroke="{series["color"]}" stroke-width="3"/>')
+            if n <= MAX_POINTS_WITH_MARKERS:
+                out.extend(f'<circle cx="{x}" cy="{y}" r="4" fill="{series["color"]}" stroke="white" stroke-width="2"/>'
+                           for x, y in run)
+    out.append('</g>')
+
+    # Event marker lines
+    for marker in spec['markers']:
+        if marker['index'] is None:
+            continue
+        x = round(x_at(marker['index']), 2)
+        y = plot_top + marker['offset'] if marker['anchor'] == 'top' else plot_bottom + marker['offset']
+        out.append(f'<line x1="{x}" y1="{plot_top}" x2="{x}" y2="{plot_bottom}" stroke="{marker["color"]}" '
+                   f'stroke-width="2" stroke-dasharray="{marker["dash"]}"/>')
+        for i, line in enumerate(marker['text']):
+            out.append(f'<text x="{x}" y="{y + i * 15}" text-anchor="middle" font-weight="bold" '
+                       f'fill="{marker["color"]}">{escape(line)}</text>')
+
+    out.append('</svg>')
+    return '\n'.join(out) + '\n'
+
+
+def _cairosvg():
+    """Return cairosvg for PNG output, with a clear error when it is not installed"""
+    try:
+        import cairosvg
+    except ImportError:
+        raise ImportError("PNG charts need cairosvg, which is not installed "
+                          "(pip install cairosvg, or request svg only)") from None
+    return cairosvg
+
+
+def render_chart_files(spec, output_dir, formats=('svg',)):
+    """Write one chart in the requested formats; returns its SVG text and the written paths"""
+    started = time.perf_counter()
+    svg = render_chart_svg(spec)
+    paths = []
+    if 'svg' in formats:
+        path = os.path.join(output_dir, spec['id'] + '.svg')
+        with open(path, 'w') as f:
+            f.write(svg)
+        paths.append(path)
+    if 'png' in formats:
+        path = os.path.join(output_dir, spec['id'] + '.png')
+        _cairosvg().svg2png(bytestring=svg.encode('utf-8'), write_to=path)
+        paths.append(path)
+    return {'id': spec['id'], 'svg': svg, 'paths': paths, 'seconds': time.perf_counter() - started}
+
+
+def write_static_report(dashboard_data, charts, output_path):
+    """No-JS report page: headline metrics and the charts as inline SVG"""
+    before, after = dashboard_data['metrics']['before'], dashboard_data['metrics']['after']
+    titles = {spec['id']: spec['title'] for spec in chart_specs(dashboard_data)}
+    with open(output_path, 'w') as f:
+        f.write('<!DOCTYPE html>\n<html lang="en">\n<head>\n<meta charset="UTF-8">\n'
+                '<title>Auto-Deploy Impact Report</title>\n</head>\n'
+                '<body style="font-family: Arial, sans-serif; max-width: 840px; margin: 0 auto;">\n'
+                '<h1>Auto-Deploy Impact Report</h1>\n')
+        f.write('<table cellpadding="6">\n<tr><th></th><th>Before</th><th>After</th></tr>\n'
+                f'<tr><td>Completion rate</td><td>{before["completion_rate"]}%</td><td>{after["completion_rate"]}%</td></tr>\n'
+                f'<tr><td>Avg deployment days</td><td>{before["avg_deployment_days"]}</td>'
+                f'<td>{after["avg_deployment_days"]}</td></tr>\n</table>\n')
+        for chart in charts:
+            f.write(f'<h3>{escape(titles[chart["id"]])}</h3>\n{chart["svg"]}')
+        f.write('</body>\n</html>\n')
+
+
+def render_static_charts(dashboard_data, output_dir, formats=('svg',)):
+    """Render the six dashboard charts without a browser, plus a no-JS report page.
+
+    Each chart renders in about a millisecond, so they are drawn one after
+    the other. PNG output needs cairosvg, which is checked before anything
+    is written.
+    """
+    if 'png' in formats:
+        _cairosvg()
+    os.makedirs(output_dir, exist_ok=True)
+    charts = [render_chart_files(spec, output_dir, formats) for spec in chart_specs(dashboard_data)]
+    report_path = os.path.join(output_dir, STATIC_REPORT_FILENAME)
+    write_static_report(dashboard_data, charts, report_path)
+    return {'report': report_path, 'charts': {chart['id']: chart['paths'] for chart in charts},
+            'seconds': {chart['id']: chart['seconds'] for chart in charts}}
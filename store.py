@@ -0,0 +1,559 @@
+import os
+import sys
+import json
+import sqlite3
+import argparse
+import numpy as np
+import pandas as pd
+from aggregation import rollup_period_totals, segment_means
+from data_loader import (ReportData, DEFAULT_STORE_FILE, DEPLOYMENTS_CSV, COVERAGE_CSV, E2E_CSV, EC2_COSTS_CSV,
+                         FEATURE_ENVS_CSV, PIPELINE_CORRELATION_CSV, PIPELINE_METRICS_JSON)
+from profiling import stage
+from quantile_sketch import DEFAULT_RELATIVE_ACCURACY, sketch_keys
+from schema import SCHEMAS, parse_datetime_column
+
+# Embedded SQLite store of the report inputs. The scrapers regenerate the CSV
+# snapshots in full; ingest() upserts them so only new, changed (or, for
+# deployments, removed) rows are written, and keeps per-day and per-month deployment aggregates current by
+# recomputing only the days and months those rows fall in. Reports then read
+# a few hundred aggregate rows (and a handful of boundary rows) with indexed
+# queries instead of rescanning years of history.
+
+STORE_VERSION = 3
+
+DAY_US = 86_400_000_000
+
+# Deployment columns as exported, plus the derived columns the queries use
+DEPLOYMENT_COLUMNS = ['pipeline_id', 'branch_name', 'branch_creation_datetime', 'deploy_prod_job_end_datetime',
+                      'days_elapsed_branch_to_deploy', 'deploy_prod_job_trigger']
+
+SCHEMA_SQL = """
+CREATE TABLE IF NOT EXISTS store_meta (key TEXT PRIMARY KEY, value TEXT);
+CREATE TABLE IF NOT EXISTS sources (file TEXT PRIMARY KEY, size INTEGER, mtime_ns INTEGER, rows INTEGER);
+CREATE TABLE IF NOT EXISTS documents (name TEXT PRIMARY KEY, content TEXT);
+
+CREATE TABLE IF NOT EXISTS deployments (
+    pipeline_id INTEGER PRIMARY KEY,
+    branch_name TEXT,
+    branch_creation_us INTEGER,  -- UTC microseconds since epoch
+    day INTEGER,                 -- UTC days since epoch
+    month TEXT,                  -- UTC 'YYYY-MM'
+    deploy_end_us INTEGER,       -- UTC microseconds since epoch, NULL if the deploy never finished
+    deploy_day INTEGER,          -- UTC days since epoch of deploy_end_us
+    days_elapsed_branch_to_deploy REAL,
+    deploy_prod_job_trigger TEXT,
+    row_hash INTEGER
+);
+CREATE INDEX IF NOT EXISTS deployments_created ON deployments (branch_creation_us);
+CREATE INDEX IF NOT EXISTS deployments_day ON deployments (day, days_elapsed_branch_to_deploy);
+CREATE INDEX IF NOT EXISTS deployments_month ON deployments (month, days_elapsed_branch_to_deploy);
+CREATE INDEX IF NOT EXISTS deployments_deploy_day ON deployments (deploy_day, days_elapsed_branch_to_deploy);
+
+CREATE TABLE IF NOT EXISTS deployment_days (
+    day INTEGER PRIMARY KEY,
+    total_pipelines INTEGER,
+    completed_pipelines INTEGER,
+    deployed_pipelines INTEGER,
+    auto_pipelines INTEGER,
+    deployed_days_sum REAL,
+    first_branch_creation_us INTEGER
+);
+-- Lead time sketch buckets of each day, packed as int64 arrays (one row per day reads fast)
+CREATE TABLE IF NOT EXISTS deployment_day_buckets (
+    day INTEGER PRIMARY KEY,
+    buckets BLOB,
+    counts BLOB
+);
+-- Deploys finished on each day and their lead time sketch buckets (the DORA inputs)
+CREATE TABLE IF NOT EXISTS deployment_deploy_days (
+    day INTEGER PRIMARY KEY,
+    deployments INTEGER,
+    buckets BLOB,
+    counts BLOB
+);
+CREATE TABLE IF NOT EXISTS deployment_months (
+    month TEXT PRIMARY KEY,
+    total_pipelines INTEGER,
+    completed_pipelines INTEGER,
+    deployed_pipelines INTEGER,
+    auto_pipelines INTEGER,
+    avg_deployment_days REAL,
+    median_deployment_days REAL,
+    p90_deployment_days REAL,
+    first_branch_creation_us INTEGER
+);
+"""
+
+# Small sources: table (named like the ReportData property) and natural key; rows are upserted on
+# the key and get an indexed month column, plus their position in the snapshot so they read back in CSV order
+TABLE_SOURCES = {
+    COVERAGE_CSV: ('coverage', 'commit_date'),
+    E2E_CSV: ('e2e_tests', 'commit_date'),
+    EC2_COSTS_CSV: ('ec2_costs', 'commit_date'),
+    FEATURE_ENVS_CSV: ('feature_envs', 'month'),
+    PIPELINE_CORRELATION_CSV: ('pipeline_success', 'month')
+}
+
+# Per-day deployment totals of the rows whose day is in the temp dirty_days table
+DAY_TOTALS_SQL = """
+SELECT day, COUNT(*), SUM(deploy_end_us IS NOT NULL),
+       SUM(IFNULL(days_elapsed_branch_to_deploy > 0, 0)), SUM(IFNULL(deploy_prod_job_trigger = 'auto', 0)),
+       TOTAL(CASE WHEN days_elapsed_branch_to_deploy > 0 THEN days_elapsed_branch_to_deploy END),
+       MIN(branch_creation_us)
+FROM deployments WHERE day IN (SELECT day FROM dirty_days) GROUP BY day
+"""
+
+# Totals of the pipelines created in a time range (boundary rows, served by the creation index)
+RANGE_TOTALS_SQL = """
+SELECT COUNT(*), IFNULL(SUM(deploy_end_us IS NOT NULL), 0),
+       IFNULL(SUM(days_elapsed_branch_to_deploy > 0), 0),
+       TOTAL(CASE WHEN days_elapsed_branch_to_deploy > 0 THEN days_elapsed_branch_to_deploy END)
+FROM deployments WHERE branch_creation_us >= ? AND branch_creation_us < ?
+"""
+
+
+def _sql_values(series):
+    """Column values as Python objects for sqlite3, missing values as NULL"""
+    return series.astype(object).where(series.notna(), None).to_numpy()
+
+
+def _quote(name):
+    """SQL identifier for a column name taken from a CSV header"""
+    return '"' + str(name).replace('"', '""') + '"'
+
+
+def _column_type(dtype):
+    if pd.api.types.is_integer_dtype(dtype) or pd.api.types.is_bool_dtype(dtype):
+        return 'INTEGER'
+    if pd.api.types.is_float_dtype(dtype):
+        return 'REAL'
+    return 'TEXT'
+
+
+def _utc_us(values):
+    """UTC microseconds since epoch of a datetime column, as nullable integers"""
+    timestamps = values.to_numpy(dtype='datetime64[us]')
+    return pd.Series(timestamps.astype(np.int64), dtype='Int64').mask(np.isnat(timestamps))
+
+
+def _pack_buckets(rows, relative_accuracy):
+    """(day, lead time) rows as one (day, bucket keys, counts) row per day, both packed as int64 bytes"""
+    day, lead_times = np.array(rows).T
+    buckets = pd.Series(sketch_keys(lead_times, relative_accuracy)).groupby(day.astype(np.int64)).value_counts()
+    return [(int(d), day_buckets.index.get_level_values(1).to_numpy(dtype=np.int64).tobytes(),
+             day_buckets.to_numpy(dtype=np.int64).tobytes())
+            for d, day_buckets in buckets.sort_index().groupby(level=0)]
+
+
+def _unpack_buckets(packed):
+    """Packed (day, bucket keys, counts) rows as a count Series indexed by (daily Period, bucket key)"""
+    keys = [np.frombuffer(row[1], dtype=np.int64) for row in packed]
+    day = np.repeat(np.array([row[0] for row in packed], dtype=np.int64), [len(k) for k in keys])
+    return pd.Series(
+        np.concatenate([np.frombuffer(row[2], dtype=np.int64) for row in packed] or [np.zeros(0, np.int64)]),
+        index=pd.MultiIndex.from_arrays([pd.PeriodIndex.from_ordinals(day, freq='D'),
+                                         np.concatenate(keys or [np.zeros(0, np.int64)])]))
+
+
+def _sorted_median_and_p90(values, counts):
+    """Median and p90 of each run of ``counts`` sorted values, combined like pandas' groupby().median()/quantile()"""
+    medians, p90s = np.zeros(len(counts)), np.zeros(len(counts))
+    start = 0
+    for i, n in enumerate(counts):
+        run = values[start:start + n]
+        medians[i] = (run[(n - 1) // 2] + run[n // 2]) / 2
+        position = 0.9 * (n - 1)
+        offset = int(position)
+        fraction = position % 1
+        p90s[i] = run[offset] if fraction == 0 else run[offset] + (run[offset + 1] - run[offset]) * fraction
+        start += n
+    return medians, p90s
+
+
+class ReportStore:
+    """SQLite store of every report input, with incrementally maintained deployment aggregates.
+
+    ``relative_accuracy`` is fixed when the store is created: it is the
+    accuracy of the lead time sketch buckets kept per day, which the rolled
+    up median/p90 and the rolling DORA lead times are read from.
+    """
+
+    def __init__(self, path=DEFAULT_STORE_FILE, relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        with self.connection:
+            self.connection.executescript(SCHEMA_SQL)
+            self.connection.execute("INSERT OR IGNORE INTO store_meta VALUES ('version', ?), ('relative_accuracy', ?)",
+                                    (str(STORE_VERSION), repr(relative_accuracy)))
+        meta = dict(self.connection.execute('SELECT key, value FROM store_meta'))
+        if int(meta['version']) != STORE_VERSION:
+            raise ValueError(f"{path} was written by store version {meta['version']}, expected {STORE_VERSION}; "
+                             f"delete it and ingest again")
+        self.relative_accuracy = float(meta['relative_accuracy'])
+
+    def close(self):
+        self.connection.close()
+
+    def _query(self, sql, params=()):
+        return pd.read_sql_query(sql, self.connection, params=params)
+
+    # Ingestion
+
+    def source_signature(self, filename):
+        """(size, mtime_ns) of the file as of its last ingestion, None if it was never ingested"""
+        row = self.connection.execute('SELECT size, mtime_ns FROM sources WHERE file = ?', (filename,)).fetchone()
+        return tuple(row) if row else None
+
+    def _record_source(self, filename, signature, rows):
+        self.connection.execute('INSERT OR REPLACE INTO sources VALUES (?, ?, ?, ?)', (filename, *signature, rows))
+
+    def upsert_deployments(self, df):
+        """Insert new and update changed pipelines, then re-aggregate only the days and months they touch.
+
+        ``df`` is a full snapshot: stored pipelines missing from it are deleted.
+        Rows are compared by a hash of their exported values, so an unchanged
+        snapshot writes nothing. Returns the number of upserted and deleted rows.
+        """
+        missing = [column for column in DEPLOYMENT_COLUMNS if column not in df]
+        if missing:
+            raise ValueError(f"{DEPLOYMENTS_CSV} has no {', '.join(missing)} column; the store needs the declared "
+                             f"deployment columns (see schema.py)")
+        unkeyed = int(df['pipeline_id'].isna().sum())
+        if unkeyed:
+            raise ValueError(f"{unkeyed:,} rows of {DEPLOYMENTS_CSV} have no pipeline_id; the store keys deployments "
+                             f"on it")
+        df = df.drop_duplicates('pipeline_id', keep='last')
+        row_hash = pd.util.hash_pandas_object(df[DEPLOYMENT_COLUMNS], index=False).to_numpy().view(np.int64)
+        known = np.array(self.connection.execute('SELECT pipeline_id, row_hash FROM deployments').fetchall(),
+                         dtype=np.int64).reshape(-1, 2)
+        positions = pd.Index(known[:, 0]).get_indexer(df['pipeline_id'].to_numpy())
+        delta = (positions < 0) | (known[positions, 1] != row_hash) if len(known) else np.ones(len(df), dtype=bool)
+        removed = known[~np.isin(known[:, 0], df['pipeline_id'].to_numpy(dtype=np.int64)), 0]
+        df, row_hash = df[delta], row_hash[delta]
+        if not len(df) and not len(removed):
+            return 0
+
+        created_us = _utc_us(df['branch_creation_datetime'])
+        deploy_end_us = _utc_us(df['deploy_prod_job_end_datetime'])
+        codes, months = pd.factorize(df['branch_creation_datetime'].to_numpy(dtype='datetime64[M]'))
+        month = np.datetime_as_string(np.asarray(months, dtype='datetime64[M]'), unit='M').astype(object)[codes]
+        month[codes < 0] = None
+        rows = zip(
+            df['pipeline_id'].to_numpy(dtype=np.int64).astype(object),
+            _sql_values(df['branch_name']),
+            _sql_values(created_us),
+            _sql_values(created_us // DAY_US),
+            month,
+            _sql_values(deploy_end_us),
+            _sql_values(deploy_end_us // DAY_US),
+            _sql_values(df['days_elapsed_branch_to_deploy']),
+            _sql_values(df['deploy_prod_job_trigger']),
+            row_hash.astype(object)
+        )
+        with self.connection:
+            self.connection.execute('CREATE TEMP TABLE IF NOT EXISTS staged_deployments AS '
+                                    'SELECT * FROM deployments WHERE 0')
+            self.connection.execute('DELETE FROM staged_deployments')
+            self.connection.executemany('INSERT INTO staged_deployments VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                        rows)
+            self.connection.execute('CREATE TEMP TABLE IF NOT EXISTS removed_deployments (pipeline_id PRIMARY KEY)')
+            self.connection.execute('DELETE FROM removed_deployments')
+            self.connection.executemany('INSERT INTO removed_deployments VALUES (?)',
+                                        [(pipeline_id,) for pipeline_id in removed.tolist()])
+            # Creation days, deploy days and months a staged row leaves or joins
+            for column, table in (('day', 'dirty_days'), ('deploy_day', 'dirty_deploy_days'),
+                                  ('month', 'dirty_months')):
+                self.connection.execute(f'CREATE TEMP TABLE IF NOT EXISTS {table} ({column} PRIMARY KEY)')
+                self.connection.execute(f'DELETE FROM {table}')
+                self.connection.execute(f"""
+                    INSERT OR IGNORE INTO {table}
+                    SELECT {column} FROM deployments
+                    WHERE pipeline_id IN (SELECT pipeline_id FROM staged_deployments
+                                          UNION SELECT pipeline_id FROM removed_deployments)
+                    UNION SELECT {column} FROM staged_deployments""")
+                self.connection.execute(f'DELETE FROM {table} WHERE {column} IS NULL')
+            columns = [row[1] for row in self.connection.execute('PRAGMA table_info(deployments)')]
+            updates = ', '.join(f'{column} = excluded.{column}' for column in columns if column != 'pipeline_id')
+            self.connection.execute(f'INSERT INTO deployments SELECT * FROM staged_deployments WHERE true '
+                                    f'ON CONFLICT (pipeline_id) DO UPDATE SET {updates}')
+            self.connection.execute('DELETE FROM deployments '
+                                    'WHERE pipeline_id IN (SELECT pipeline_id FROM removed_deployments)')
+            self._refresh_days()
+            self._refresh_deploy_days()
+            self._refresh_months()
+        return len(df) + len(removed)
+
+    def _refresh_days(self):
+        """Recompute the totals and lead time sketch buckets of the days in dirty_days"""
+        self.connection.execute('DELETE FROM deployment_days WHERE day IN (SELECT day FROM dirty_days)')
+        self.connection.execute('DELETE FROM deployment_day_buckets WHERE day IN (SELECT day FROM dirty_days)')
+        self.connection.execute('INSERT INTO deployment_days ' + DAY_TOTALS_SQL)
+        deployed = self.connection.execute(
+            'SELECT day, days_elapsed_branch_to_deploy FROM deployments '
+            'WHERE day IN (SELECT day FROM dirty_days) AND days_elapsed_branch_to_deploy > 0').fetchall()
+        if deployed:
+            self.connection.executemany('INSERT INTO deployment_day_buckets VALUES (?, ?, ?)',
+                                        _pack_buckets(deployed, self.relative_accuracy))
+
+    def _refresh_deploy_days(self):
+        """Recompute the deploy counts and lead time sketch buckets of the days in dirty_deploy_days"""
+        self.connection.execute(
+            'DELETE FROM deployment_deploy_days WHERE day IN (SELECT deploy_day FROM dirty_deploy_days)')
+        counts = dict(self.connection.execute(
+            'SELECT deploy_day, COUNT(*) FROM deployments '
+            'WHERE deploy_day IN (SELECT deploy_day FROM dirty_deploy_days) GROUP BY deploy_day'))
+        deployed = self.connection.execute(
+            'SELECT deploy_day, days_elapsed_branch_to_deploy FROM deployments '
+            'WHERE deploy_day IN (SELECT deploy_day FROM dirty_deploy_days) AND days_elapsed_branch_to_deploy > 0'
+        ).fetchall()
+        packed = {row[0]: row[1:] for row in _pack_buckets(deployed, self.relative_accuracy)} if deployed else {}
+        empty = (np.zeros(0, np.int64).tobytes(),) * 2
+        self.connection.executemany('INSERT INTO deployment_deploy_days VALUES (?, ?, ?, ?)',
+                                    [(day, count, *packed.get(day, empty)) for day, count in counts.items()])
+
+    def _refresh_months(self):
+        """Recompute the exact stats of the months in dirty_months (ordered scans of the month index)"""
+        self.connection.execute('DELETE FROM deployment_months WHERE month IN (SELECT month FROM dirty_months)')
+        totals = self._query("""
+            SELECT month, COUNT(*) AS total_pipelines,
+                   SUM(deploy_end_us IS NOT NULL) AS completed_pipelines,
+                   SUM(IFNULL(deploy_prod_job_trigger = 'auto', 0)) AS auto_pipelines,
+                   MIN(branch_creation_us) AS first_branch_creation_us
+            FROM deployments WHERE month IN (SELECT month FROM dirty_months) GROUP BY month ORDER BY month""")
+        deployed = self.connection.execute("""
+            SELECT month, days_elapsed_branch_to_deploy FROM deployments
+            WHERE month IN (SELECT month FROM dirty_months) AND days_elapsed_branch_to_deploy > 0
+            ORDER BY month, days_elapsed_branch_to_deploy""").fetchall()
+        months = pd.Series([row[0] for row in deployed], dtype=object)
+        values = np.array([row[1] for row in deployed], dtype=float)
+        counts = months.value_counts(sort=False).reindex(totals['month'], fill_value=0).to_numpy()
+        medians, p90s = np.zeros(len(counts)), np.zeros(len(counts))
+        has = counts > 0
+        medians[has], p90s[has] = _sorted_median_and_p90(values, counts[has])
+        rows = zip(totals['month'], totals['total_pipelines'], totals['completed_pipelines'], counts,
+                   totals['auto_pipelines'], segment_means(values, counts), medians, p90s,
+                   totals['first_branch_creation_us'])
+        self.connection.executemany('INSERT INTO deployment_months VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)',
+                                    [tuple(value.item() if hasattr(value, 'item') else value for value in row)
+                                     for row in rows])
+
+    def upsert_table(self, filename, df):
+        """Upsert a small snapshot on its natural key and drop the keys it no longer has.
+
+        The table is created from the first snapshot. Rows keep their position
+        in the snapshot, so read_table() returns them in CSV order.
+        """
+        table, key = TABLE_SOURCES[filename]
+        if key not in df:
+            raise ValueError(f"{filename} has no {key} column to key its rows on")
+        rows = df.copy()
+        if pd.api.types.is_datetime64_any_dtype(rows[key]):
+            rows[key] = rows[key].dt.strftime('%Y-%m-%d %H:%M:%S')
+        if key != 'month':
+            rows.insert(1, 'month', rows[key].str[:7])
+        rows['snapshot_row'] = np.arange(len(rows))
+        rows = rows.drop_duplicates(key, keep='last')
+        columns = list(rows.columns)
+        definitions = ', '.join(f'{_quote(column)} {_column_type(rows[column].dtype)}'
+                                + (' PRIMARY KEY' if column == key else '') for column in columns)
+        updates = ', '.join(f'{_quote(column)} = excluded.{_quote(column)}' for column in columns if column != key)
+        with self.connection:
+            self.connection.execute(f'CREATE TABLE IF NOT EXISTS {table} ({definitions})')
+            if key != 'month':
+                self.connection.execute(f'CREATE INDEX IF NOT EXISTS {table}_month ON {table} (month)')
+            self.connection.executemany(
+                f"INSERT INTO {table} ({', '.join(map(_quote, columns))}) VALUES ({', '.join('?' * len(columns))}) "
+                f"ON CONFLICT ({_quote(key)}) DO UPDATE SET {updates}",
+                zip(*[_sql_values(rows[column]) for column in columns]))
+            self.connection.execute('CREATE TEMP TABLE IF NOT EXISTS snapshot_keys (key PRIMARY KEY)')
+            self.connection.execute('DELETE FROM snapshot_keys')
+            self.connection.executemany('INSERT INTO snapshot_keys VALUES (?)', ((k,) for k in _sql_values(rows[key])))
+            self.connection.execute(f'DELETE FROM {table} WHERE {_quote(key)} NOT IN (SELECT key FROM snapshot_keys)')
+        return len(rows)
+
+    def ingest(self, data_dir='.'):
+        """Upsert every input of ``data_dir`` that changed since it was last ingested.
+
+        Returns {file name: upserted (or removed) rows} for the files that were read.
+        """
+        data = ReportData(data_dir)
+        upserted = {}
+        for filename in [DEPLOYMENTS_CSV, *TABLE_SOURCES, PIPELINE_METRICS_JSON]:
+            path = os.path.join(data_dir, filename)
+            if not os.path.exists(path):
+                continue
+            stat = os.stat(path)
+            signature = (stat.st_size, stat.st_mtime_ns)
+            if signature == self.source_signature(filename):
+                continue
+            with stage(f'ingest {filename}'):
+                if filename == DEPLOYMENTS_CSV:
+                    upserted[filename] = self.upsert_deployments(data.deployments)
+                elif filename == PIPELINE_METRICS_JSON:
+                    with self.connection:
+                        self.connection.execute('INSERT OR REPLACE INTO documents VALUES (?, ?)',
+                                                (filename, json.dumps(data.pipeline_metrics)))
+                    upserted[filename] = 1
+                else:
+                    upserted[filename] = self.upsert_table(filename, getattr(data, TABLE_SOURCES[filename][0]))
+            with self.connection:
+                self._record_source(filename, signature, upserted[filename])
+        return upserted
+
+    # Queries
+
+    def read_table(self, filename):
+        """A small source as the typed DataFrame ReportData would read from its CSV, in CSV order"""
+        table, key = TABLE_SOURCES[filename]
+        df = self._query(f'SELECT * FROM {table} ORDER BY snapshot_row').drop(columns='snapshot_row')
+        if key != 'month':
+            df = df.drop(columns='month')
+        schema = SCHEMAS[filename]
+        for column, spec in schema['datetimes'].items():
+            df[column], _ = parse_datetime_column(df[column], spec['format'], spec['tz'])
+        return df.astype({column: dtype for column, dtype in schema['dtypes'].items() if column in df})
+
+    def read_document(self, filename):
+        row = self.connection.execute('SELECT content FROM documents WHERE name = ?', (filename,)).fetchone()
+        if row is None:
+            raise FileNotFoundError(f"{filename} was never ingested into {self.path}")
+        return json.loads(row[0])
+
+    def read_deployments(self):
+        """Every stored pipeline as a deployments DataFrame, in branch creation order"""
+        df = self._query(f"""
+            SELECT pipeline_id, branch_name, branch_creation_us, deploy_end_us,
+                   days_elapsed_branch_to_deploy, deploy_prod_job_trigger
+            FROM deployments ORDER BY branch_creation_us, pipeline_id""")
+        df.insert(2, 'branch_creation_datetime', pd.to_datetime(df.pop('branch_creation_us'), unit='us', utc=True))
+        df.insert(3, 'deploy_prod_job_end_datetime', pd.to_datetime(df.pop('deploy_end_us'), unit='us', utc=True))
+        return df.astype({'days_elapsed_branch_to_deploy': 'float64', 'deploy_prod_job_trigger': 'category'})
+
+    def monthly_stats(self, key='year_month'):
+        """deployment_period_stats() columns for every month, read from the maintained month table"""
+        months = self._query('SELECT * FROM deployment_months ORDER BY month')
+        stats = months.drop(columns=['month', 'first_branch_creation_us'])
+        stats.insert(0, key, pd.PeriodIndex(months['month'], freq='M'))
+        stats['completion_rate'] = stats['completed_pipelines'] / stats['total_pipelines'] * 100
+        stats['failure_rate'] = 1 - (stats['completed_pipelines'] / stats['total_pipelines'])
+        stats['auto_percentage'] = stats['auto_pipelines'] / stats['total_pipelines'] * 100
+        stats['first_branch_creation'] = pd.to_datetime(months['first_branch_creation_us'], unit='us', utc=True)
+        return stats
+
+    def _daily(self):
+        """Per-day totals and (day, bucket) sketch counts, both keyed by daily Periods"""
+        days = self._query('SELECT * FROM deployment_days ORDER BY day')
+        base = days.drop(columns=['day', 'first_branch_creation_us'])
+        base.index = pd.PeriodIndex.from_ordinals(days['day'].to_numpy(), freq='D')
+        base['first_branch_creation'] = pd.to_datetime(days['first_branch_creation_us'], unit='us', utc=True).array
+        buckets = _unpack_buckets(self.connection.execute(
+            'SELECT day, buckets, counts FROM deployment_day_buckets ORDER BY day').fetchall())
+        return base, buckets
+
+    def rollups(self, freqs, key='period'):
+        """aggregation.period_rollups() results rolled up from the maintained day tables"""
+        base, buckets = self._daily()
+        return {freq: rollup_period_totals(base, buckets, freq, key, self.relative_accuracy) for freq in freqs}
+
+    def daily_lead_time_totals(self):
+        """dora_metrics.daily_lead_time_totals() from the maintained creation and deploy day tables"""
+        created = self._query('SELECT day, total_pipelines, completed_pipelines FROM deployment_days ORDER BY day')
+        deployed = self.connection.execute(
+            'SELECT day, deployments, buckets, counts FROM deployment_deploy_days ORDER BY day').fetchall()
+        buckets = _unpack_buckets([(row[0], row[2], row[3]) for row in deployed])
+        known = np.concatenate([created['day'].to_numpy(dtype=np.int64),
+                                np.array([row[0] for row in deployed], dtype=np.int64)])
+        days = pd.PeriodIndex.from_ordinals(np.arange(known.min(), known.max() + 1) if len(known) else known,
+                                            freq='D')
+        totals = created.set_index(pd.PeriodIndex.from_ordinals(created['day'].to_numpy(), freq='D')).reindex(
+            days, fill_value=0)
+        deployments = pd.Series([row[1] for row in deployed], dtype=np.int64, index=pd.PeriodIndex.from_ordinals(
+            np.array([row[0] for row in deployed], dtype=np.int64), freq='D')).reindex(days, fill_value=0)
+        if len(buckets):
+            bucket_level = buckets.index.get_level_values(1)
+            keys = np.arange(bucket_level.min(), bucket_level.max() + 1)
+            matrix = buckets.unstack(fill_value=0).reindex(index=days, columns=keys, fill_value=0).to_numpy()
+        else:
+            keys, matrix = np.zeros(1, dtype=np.int64), np.zeros((len(days), 1), dtype=np.int64)
+        return (days, totals['total_pipelines'].to_numpy(), totals['completed_pipelines'].to_numpy(),
+                deployments.to_numpy(), matrix, keys)
+
+    def _range_totals(self, start_us=None, end_us=None):
+        """[total, completed, deployed, deployed days sum] of the pipelines created in [start_us, end_us).
+
+        Whole days come from the day table; only the rows of the partial days
+        at each end are read, through the branch creation index.
+        """
+        first_day = -(-start_us // DAY_US) if start_us is not None else None
+        end_day = end_us // DAY_US if end_us is not None else None
+        edges = []
+        if first_day is not None and end_day is not None and first_day >= end_day:
+            edges.append((start_us, end_us))
+            day_filter = None
+        else:
+            if first_day is not None:
+                edges.append((start_us, first_day * DAY_US))
+            if end_day is not None:
+                edges.append((end_day * DAY_US, end_us))
+            day_filter = (first_day if first_day is not None else -2**62, end_day if end_day is not None else 2**62)
+        totals = np.zeros(4)
+        if day_filter is not None:
+            row = self.connection.execute("""
+                SELECT IFNULL(SUM(total_pipelines), 0), IFNULL(SUM(completed_pipelines), 0),
+                       IFNULL(SUM(deployed_pipelines), 0), TOTAL(deployed_days_sum)
+                FROM deployment_days WHERE day >= ? AND day < ?""", day_filter).fetchone()
+            totals += row
+        for edge in edges:
+            totals += self.connection.execute(RANGE_TOTALS_SQL, edge).fetchone()
+        return totals
+
+    def _split_side(self, start_us, end_us):
+        total, completed, deployed, days_sum = self._range_totals(start_us, end_us)
+        return {
+            'total_pipelines': int(total),
+            'completed_pipelines': int(completed),
+            'deployed_pipelines': int(deployed),
+            'avg_deployment_days': days_sum / deployed if deployed > 0 else 0
+        }
+
+    def event_split_stats(self, event_dates, window=None):
+        """aggregation.event_split_stats() with indexed queries (averages exact up to summation order)"""
+        window_us = pd.Timedelta(window) // pd.Timedelta(microseconds=1) if window is not None else None
+        splits = []
+        for date in event_dates:
+            # Timestamp.value is UTC nanoseconds
+            date_us = pd.Timestamp(date).value // 1000
+            start = date_us - window_us if window_us is not None else None
+            end = date_us + window_us if window_us is not None else None
+            splits.append({'before': self._split_side(start, date_us), 'after': self._split_side(date_us, end)})
+        return splits
+
+    def split_stats(self, split_date):
+        """aggregation.split_stats() with indexed queries"""
+        return self.event_split_stats([split_date])[0]
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(
+        description="Upsert the report inputs of a data directory into the SQLite store")
+    parser.add_argument('data_dir', nargs='?', default='.',
+                        help="Directory with the CSV/JSON inputs (default: current directory)")
+    parser.add_argument('--store', default=None,
+                        help=f"Store file (default: {DEFAULT_STORE_FILE} in the data directory)")
+    parser.add_argument('--sketch-accuracy', type=float, default=DEFAULT_RELATIVE_ACCURACY,
+                        help="Relative accuracy of the stored lead time sketches (only used when creating the store)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    store_path = args.store or os.path.join(args.data_dir, DEFAULT_STORE_FILE)
+    store = ReportStore(store_path, args.sketch_accuracy)
+    upserted = store.ingest(args.data_dir)
+    store.close()
+    if not upserted:
+        print(f"✅ No input changed since the last ingestion into '{store_path}'")
+        sys.exit(0)
+    for filename, rows in upserted.items():
+        print(f"📥 {filename}: {rows:,} rows written")
+    print(f"✅ Store '{store_path}' is up to date")
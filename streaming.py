@@ -0,0 +1,125 @@
+import pandas as pd
+from schema import SCHEMAS, parse_datetime_column
+from quantile_sketch import QuantileSketch, sketch_keys, DEFAULT_RELATIVE_ACCURACY
+from aggregation import SKETCH_COLUMN, sketch_quantiles
+
+DEFAULT_CHUNKSIZE = 500_000
+
+# The only deployment columns the report uses
+DEPLOYMENT_COLUMNS = [
+    'branch_creation_datetime',
+    'deploy_prod_job_end_datetime',
+    'days_elapsed_branch_to_deploy',
+    'deploy_prod_job_trigger'
+]
+
+
+class DeploymentAccumulator:
+    """Running per-period aggregates of the deployment export.
+
+    Chunks are folded into counts and sums per (period, before/after split)
+    and into one QuantileSketch per period for the median/p90, so memory is
+    bounded by the chunk size and the number of periods, not by the file.
+    Means are exact up to float summation order; quantiles are within the
+    sketch's relative accuracy.
+    """
+
+    def __init__(self, freq='M', split_date=None, relative_accuracy=DEFAULT_RELATIVE_ACCURACY, key='year_month'):
+        self.freq = freq
+        self.split_date = pd.to_datetime(split_date) if split_date is not None else None
+        self.relative_accuracy = relative_accuracy
+        self.key = key
+        self.totals = None
+        self.first_created = None
+        self.sketch_counts = None
+        self.rows = 0
+        self.parse_fallbacks = 0
+
+    def add_chunk(self, chunk):
+        """Fold one chunk of raw deployment rows into the accumulators"""
+        spec = SCHEMAS['deploy_prod_pipelines_2022_2025_argocd_refined.csv']['datetimes']['branch_creation_datetime']
+        created, fallbacks = parse_datetime_column(chunk['branch_creation_datetime'], spec['format'], spec['tz'])
+        self.parse_fallbacks += fallbacks
+        self.rows += len(chunk)
+
+        period = created.dt.to_period(self.freq).rename(self.key)
+        after = (created >= self.split_date) if self.split_date is not None else pd.Series(False, index=chunk.index)
+        days = chunk['days_elapsed_branch_to_deploy']
+        deployed = days > 0
+
+        frame = pd.DataFrame({
+            'total_pipelines': 1,
+            'completed_pipelines': chunk['deploy_prod_job_end_datetime'].notna(),
+            'deployed_pipelines': deployed,
+            'auto_pipelines': chunk['deploy_prod_job_trigger'] == 'auto',
+            'deployed_days_sum': days.where(deployed, 0.0)
+        }, index=chunk.index)
+        totals = frame.groupby([period, after.rename('after')]).sum()
+        self.totals = totals if self.totals is None else self.totals.add(totals, fill_value=0)
+
+        first_created = created.groupby(period).first()
+        self.first_created = first_created if self.first_created is None else self.first_created.combine_first(first_created)
+
+        keys = pd.Series(sketch_keys(days[deployed], self.relative_accuracy), index=days.index[deployed], name='bucket')
+        counts = keys.groupby([period[deployed], keys]).size()
+        self.sketch_counts = counts if self.sketch_counts is None else self.sketch_counts.add(counts, fill_value=0)
+
+    def sketches(self):
+        """One QuantileSketch of deployed days per period"""
+        if self.sketch_counts is None or self.sketch_counts.empty:
+            return {}
+        return {
+            period: QuantileSketch(self.relative_accuracy, counts.droplevel(0))
+            for period, counts in self.sketch_counts.astype('int64').groupby(level=0)
+        }
+
+    def period_stats(self):
+        """Per-period stats like aggregation.deployment_period_stats() (sketches included)"""
+        columns = ['total_pipelines', 'completed_pipelines', 'deployed_pipelines', 'auto_pipelines']
+        if self.totals is None:
+            return pd.DataFrame(columns=[self.key] + columns)
+        totals = self.totals.groupby(level=0).sum()
+        stats = totals[columns].astype('int64')
+        stats['avg_deployment_days'] = (totals['deployed_days_sum'] / stats['deployed_pipelines']).where(
+            stats['deployed_pipelines'] > 0, 0.0)
+
+        sketches = self.sketches()
+        stats[SKETCH_COLUMN] = pd.Series(
+            [sketches.get(p, QuantileSketch(self.relative_accuracy)) for p in stats.index], index=stats.index, dtype=object)
+        sketch_quantiles(stats)
+
+        stats['completion_rate'] = stats['completed_pipelines'] / stats['total_pipelines'] * 100
+        stats['failure_rate'] = 1 - (stats['completed_pipelines'] / stats['total_pipelines'])
+        stats['auto_percentage'] = stats['auto_pipelines'] / stats['total_pipelines'] * 100
+        stats['first_branch_creation'] = self.first_created.reindex(stats.index)
+        stats.index.name = self.key
+        return stats.reset_index()
+
+    def split_stats(self):
+        """Totals before and after split_date, like aggregation.split_stats()"""
+        if self.totals is None:
+            totals = pd.DataFrame(0, index=[False, True], columns=['total_pipelines', 'completed_pipelines',
+                                                                  'deployed_pipelines', 'deployed_days_sum'])
+        else:
+            totals = self.totals.groupby(level='after').sum().reindex([False, True], fill_value=0)
+        result = {}
+        for name, after in (('before', False), ('after', True)):
+            row = totals.loc[after]
+            deployed = int(row['deployed_pipelines'])
+            result[name] = {
+                'total_pipelines': int(row['total_pipelines']),
+                'completed_pipelines': int(row['completed_pipelines']),
+                'deployed_pipelines': deployed,
+                'avg_deployment_days': row['deployed_days_sum'] / deployed if deployed > 0 else 0
+            }
+        return result
+
+
+def stream_deployments(path, freq='M', split_date=None, chunksize=DEFAULT_CHUNKSIZE,
+                       relative_accuracy=DEFAULT_RELATIVE_ACCURACY):
+    """Read the deployment export in chunks of only the needed columns and aggregate it"""
+    dtypes = SCHEMAS['deploy_prod_pipelines_2022_2025_argocd_refined.csv']['dtypes']
+    accumulator = DeploymentAccumulator(freq, split_date, relative_accuracy)
+    for chunk in pd.read_csv(path, usecols=DEPLOYMENT_COLUMNS, dtype=dtypes, chunksize=chunksize):
+        accumulator.add_chunk(chunk)
+    return accumulator
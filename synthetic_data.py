@@ -0,0 +1,135 @@
+import os
+import json
+import argparse
+import numpy as np
+import pandas as pd
+from data_loader import (DEPLOYMENTS_CSV, COVERAGE_CSV, E2E_CSV, EC2_COSTS_CSV, FEATURE_ENVS_CSV,
+                         PIPELINE_CORRELATION_CSV, PIPELINE_METRICS_JSON)
+
+# Histories end here and the auto-deploy switch sits inside them, like the real export
+HISTORY_END = pd.Timestamp('2025-08-31T23:59:59Z')
+AUTODEPLOY_DATE = pd.Timestamp('2023-12-12T14:13:04.057Z')
+DEFAULT_CHUNK_ROWS = 1_000_000
+
+
+def parse_count(text):
+    """'10k', '2.5M' or '1000000' -> int"""
+    text = str(text).strip().replace('_', '')
+    multiplier = {'k': 1_000, 'm': 1_000_000}.get(text[-1:].lower(), 1)
+    return int(float(text[:-1] if multiplier > 1 else text) * multiplier)
+
+
+def _iso(timestamps):
+    """Export-style ISO 8601 UTC strings with milliseconds (vectorized)"""
+    return np.char.add(np.datetime_as_string(timestamps, unit='ms'), 'Z')
+
+
+def write_deployments(path, rows, start, rng, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Pipeline rows sorted by branch creation, written in chunks so any size fits in memory"""
+    span_ns = (HISTORY_END - start).value
+    n_chunks = max(1, -(-rows // chunk_rows))
+    written = 0
+    for chunk in range(n_chunks):
+        n = rows // n_chunks + (1 if chunk < rows % n_chunks else 0)
+        # Each chunk covers its own slice of the history, so the file stays sorted
+        low = start.value + span_ns * chunk // n_chunks
+        high = start.value + span_ns * (chunk + 1) // n_chunks
+        created = np.sort(rng.integers(low, high, n)).astype('datetime64[ns]')
+        post = created >= AUTODEPLOY_DATE.tz_localize(None).to_datetime64()
+
+        # Auto-deploy: faster, mostly automatic, and far more pipelines reach production
+        completed = rng.random(n) < np.where(post, 0.9, 0.06)
+        days = np.round(rng.gamma(1.5, np.where(post, 1.8, 4.5)), 2)
+        days = np.where(~completed & post, 0.0, days)
+        ended = created + (days * 86_400_000).astype('timedelta64[ms]')
+        trigger = np.where(rng.random(n) < np.where(post, 0.95, 0.2), 'auto', 'manual')
+
+        ids = np.arange(written, written + n)
+        pd.DataFrame({
+            'pipeline_id': ids,
+            'branch_name': np.char.add('feature-', ids.astype(str)),
+            'branch_creation_datetime': _iso(created),
+            'deploy_prod_job_end_datetime': np.where(completed, _iso(ended), None),
+            'days_elapsed_branch_to_deploy': days,
+            'deploy_prod_job_trigger': trigger
+        }).to_csv(path, mode='w' if chunk == 0 else 'a', header=chunk == 0, index=False)
+        written += n
+    return written
+
+
+def generate_dataset(output_dir, rows=10_000, years=3, seed=0, chunk_rows=DEFAULT_CHUNK_ROWS):
+    """Write schema-correct versions of all seven report inputs.
+
+    ``rows`` deployment pipelines are spread over ``years`` of history ending
+    in August 2025, with the auto-deploy switch in December 2023 (so at least
+    3 years keeps both sides populated). The smaller inputs scale with the
+    history length. Returns the number of rows written per file.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    rng = np.random.default_rng(seed)
+    start = (HISTORY_END - pd.DateOffset(years=years)).normalize() + pd.Timedelta(days=1)
+    counts = {DEPLOYMENTS_CSV: write_deployments(os.path.join(output_dir, DEPLOYMENTS_CSV), rows, start, rng,
+                                                 chunk_rows)}
+
+    # Test coverage and e2e counts every 3 days, EC2 costs every 6 days
+    commits = pd.date_range(start.tz_localize(None), HISTORY_END.tz_localize(None), freq='3D')
+    trend = np.linspace(0, 1, len(commits))
+    frames = {
+        COVERAGE_CSV: pd.DataFrame({
+            'commit_date': commits.strftime('%Y-%m-%d %H:%M:%S'),
+            'code_coverage': np.round(60 + 32 * trend + rng.random(len(commits)), 2)
+        }),
+        E2E_CSV: pd.DataFrame({
+            'commit_date': commits.strftime('%Y-%m-%d %H:%M:%S'),
+            'number_of_tests': (trend * 20).astype(int)
+        }),
+        EC2_COSTS_CSV: pd.DataFrame({
+            'commit_date': commits[::2].strftime('%Y-%m-%d'),
+            'ec2_cost_usd': np.round(rng.uniform(0, 2000, len(commits[::2])), 4)
+        })
+    }
+
+    months = pd.period_range(start, HISTORY_END, freq='M').astype(str)
+    events = rng.integers(50, 200, len(months))
+    failures = rng.binomial(events, 0.05)
+    frames[FEATURE_ENVS_CSV] = pd.DataFrame({'month': months, 'count': rng.integers(0, 80, len(months))})
+    frames[PIPELINE_CORRELATION_CSV] = pd.DataFrame({'month': months, 'total_events': events, 'failures': failures})
+    for filename, frame in frames.items():
+        frame.to_csv(os.path.join(output_dir, filename), index=False)
+        counts[filename] = len(frame)
+
+    metrics = {
+        'summary': {
+            'total_pipeline_events': int(events.sum()),
+            'total_failures': int(failures.sum()),
+            'overall_failure_rate': round(float(failures.sum() / events.sum() * 100), 2)
+        },
+        'monthly_data': {
+            'months': list(months),
+            'failure_rates': np.round(failures / events * 100, 2).tolist()
+        }
+    }
+    with open(os.path.join(output_dir, PIPELINE_METRICS_JSON), 'w') as f:
+        json.dump(metrics, f, indent=2)
+    counts[PIPELINE_METRICS_JSON] = len(months)
+    return counts
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Generate synthetic report inputs for benchmarks and demos")
+    parser.add_argument('output_dir', help="Directory to write the seven input files to")
+    parser.add_argument('--rows', type=parse_count, default=10_000,
+                        help="Deployment pipeline rows, e.g. 10k or 50M")
+    parser.add_argument('--years', type=int, default=3, help="Years of history ending in August 2025")
+    parser.add_argument('--seed', type=int, default=0, help="Random seed")
+    parser.add_argument('--chunk-rows', type=parse_count, default=DEFAULT_CHUNK_ROWS,
+                        help="Deployment rows generated and written at a time")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    counts = generate_dataset(args.output_dir, args.rows, args.years, args.seed, args.chunk_rows)
+    for filename, rows in counts.items():
+        print(f"   {filename:<55} {rows:>12,} rows")
+    print(f"✅ Synthetic data written to '{args.output_dir}'")
@@ -0,0 +1,21 @@
+import os
+import batch_reports
+
+
+def _crash_one_tenant(data_dir, use_cache=True, static_charts=False):
+    """Stand-in for generate_tenant_report() whose worker dies for the 'crash' tenant"""
+    if os.path.basename(data_dir) == 'crash':
+        os._exit(9)
+    return {'tenant': data_dir, 'status': 'ok', 'seconds': 0.0}
+
+
+def test_worker_crash_fails_only_its_tenant(monkeypatch, tmp_path):
+    monkeypatch.setattr(batch_reports, 'generate_tenant_report', _crash_one_tenant)
+    tenants = [str(tmp_path / name) for name in ('team-a', 'team-b', 'crash', 'team-c', 'team-d')]
+
+    results = batch_reports.generate_reports(tenants, max_workers=2)
+
+    assert [result['tenant'] for result in results] == tenants
+    statuses = {os.path.basename(result['tenant']): result['status'] for result in results}
+    assert statuses == {'team-a': 'ok', 'team-b': 'ok', 'crash': 'failed', 'team-c': 'ok', 'team-d': 'ok'}
+    assert 'BrokenProcessPool' in results[2]['error']
@@ -0,0 +1,40 @@
+import base64
+import numpy as np
+from dashboard_renderer import compact_payload
+
+
+def _unpack(value, axis):
+    """Python mirror of unpackDashboard() in the page"""
+    if isinstance(value, list):
+        return [_unpack(v, axis) for v in value]
+    if not isinstance(value, dict):
+        return value
+    if '$axis' in value:
+        start, length = value['$axis']
+        return axis[start:start + length]
+    if '$axis_i32' in value:
+        return [axis[i] for i in np.frombuffer(base64.b64decode(value['$axis_i32']), '<i4')]
+    if '$i32' in value:
+        return [int(v) for v in np.frombuffer(base64.b64decode(value['$i32']), '<i4')]
+    if '$f32' in value:
+        # toPrecision(7) of the Float32 value, like the decoder
+        return [None if np.isnan(v) else float(f'{float(v):.7g}')
+                for v in np.frombuffer(base64.b64decode(value['$f32']), '<f4')]
+    if '$f64' in value:
+        return [None if np.isnan(v) else float(v) for v in np.frombuffer(base64.b64decode(value['$f64']), '<f8')]
+    return {k: _unpack(v, axis) for k, v in value.items()}
+
+
+def test_compact_payload_round_trips_large_values():
+    data = {
+        'ec2_data': {'months': ['2024-01', '2024-02', '2024-03'], 'costs': [123456.78, 99999.99, None]},
+        'monthly_data': {'months': ['2024-02', '2024-03'], 'rates': [12.5, 97.3], 'counts': [3, 4]},
+        'savings': [1234567.891, -2.5e-7, 0.1]
+    }
+
+    payload = compact_payload(data)
+
+    assert _unpack(payload['data'], payload['axis']) == data
+    # Short decimals still use the smaller Float32 arrays
+    assert '$f32' in payload['data']['monthly_data']['rates']
+    assert '$f64' in payload['data']['ec2_data']['costs']
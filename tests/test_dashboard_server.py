@@ -0,0 +1,28 @@
+import pytest
+import dashboard_server
+from data_loader import COVERAGE_CSV
+
+
+def test_failed_rebuild_is_retried(monkeypatch, tmp_path):
+    builds = []
+
+    def build(data):
+        builds.append(len(builds))
+        if len(builds) == 2:
+            raise ValueError('export being rewritten')
+        return {'build': len(builds)}
+
+    monkeypatch.setattr(dashboard_server, 'build_dashboard_data', build)
+    monkeypatch.setattr(dashboard_server, 'render_dashboard', lambda data, **options: str(data))
+    dashboard = dashboard_server.TenantDashboard(str(tmp_path))
+    first_etag, _, _ = dashboard.current()
+
+    (tmp_path / COVERAGE_CSV).write_text('commit_date,code_coverage\n2024-01-01,50.0\n')
+    with pytest.raises(ValueError):
+        dashboard.current()
+    etag, data_json, _ = dashboard.current()
+
+    assert len(builds) == 3
+    assert etag != first_etag and data_json == b'{"build": 3}'
+    # Nothing changed since the successful retry
+    assert dashboard.current()[0] == etag and len(builds) == 3
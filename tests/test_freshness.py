@@ -0,0 +1,20 @@
+from freshness import run_signature, is_fresh, write_stamp
+
+
+def test_changed_template_invalidates_the_last_run(tmp_path):
+    code_dir = tmp_path / 'code'
+    code_dir.mkdir()
+    (code_dir / 'dashboard_renderer.py').write_text('VERSION = 1\n')
+    template = code_dir / 'dashboard_template.html'
+    template.write_text('<html>@@dashboard_data@@</html>\n')
+    source = tmp_path / 'input.csv'
+    source.write_text('a,b\n1,2\n')
+    output = tmp_path / 'dashboard.html'
+    output.write_text('<html></html>\n')
+    stamp = tmp_path / 'last_run.json'
+
+    write_stamp(run_signature([str(source)], {}, str(code_dir)), [str(output)], str(stamp))
+    assert is_fresh(run_signature([str(source)], {}, str(code_dir)), [str(output)], str(stamp))
+
+    template.write_text('<html><body>@@dashboard_data@@</body></html>\n')
+    assert not is_fresh(run_signature([str(source)], {}, str(code_dir)), [str(output)], str(stamp))
@@ -0,0 +1,67 @@
+import numpy as np
+import pandas as pd
+from aggregation import deployment_period_stats
+from incremental import incremental_period_stats, DEPLOYMENTS_SCHEMA
+from schema import read_csv_with_schema
+from synthetic_data import write_deployments, HISTORY_END
+
+
+def _full_stats(path, sketch_accuracy=None):
+    return deployment_period_stats(read_csv_with_schema(path, DEPLOYMENTS_SCHEMA)[0], sketch_accuracy=sketch_accuracy)
+
+
+def _export_lines(tmp_path, rows=3_000):
+    """Header and rows of a synthetic deployment export"""
+    source = tmp_path / 'generated.csv'
+    write_deployments(source, rows, HISTORY_END - pd.Timedelta(days=400), np.random.default_rng(7))
+    lines = source.read_text().splitlines(keepends=True)
+    return lines[0], lines[1:]
+
+
+def _loader(path, calls):
+    def load_rows():
+        calls.append(path)
+        return read_csv_with_schema(path, DEPLOYMENTS_SCHEMA)[0]
+    return load_rows
+
+
+def test_appended_rows_match_a_full_rebuild(tmp_path):
+    header, rows = _export_lines(tmp_path)
+    path = tmp_path / 'deployments.csv'
+    calls = []
+
+    for sketch_accuracy in (None, 0.01):
+        state_dir = tmp_path / f'state-{sketch_accuracy}'
+        path.write_text(header + ''.join(rows[:2_500]))
+        incremental_period_stats(path, state_dir, sketch_accuracy=sketch_accuracy, load_rows=_loader(path, calls))
+        # New rows of the last months plus a late row of an early month
+        with open(path, 'a') as f:
+            f.write(''.join(rows[2_500:]) + rows[10])
+        stats = incremental_period_stats(path, state_dir, sketch_accuracy=sketch_accuracy,
+                                         load_rows=_loader(path, calls))
+        expected = _full_stats(path, sketch_accuracy)
+        if sketch_accuracy is not None:
+            assert [s.to_dict() for s in stats.pop('deployment_days_sketch')] == \
+                   [s.to_dict() for s in expected.pop('deployment_days_sketch')]
+        pd.testing.assert_frame_equal(stats, expected, check_exact=True)
+
+    # Only the first run of each state loaded the whole export
+    assert len(calls) == 2
+
+
+def test_rewritten_rows_rebuild_the_state(tmp_path):
+    header, rows = _export_lines(tmp_path)
+    path = tmp_path / 'deployments.csv'
+    path.write_text(header + ''.join(rows))
+    state_dir = tmp_path / 'state'
+    incremental_period_stats(path, state_dir)
+
+    # An early row edited, then one row appended
+    rows[3] = rows[3].replace(',auto', ',manual', 1) if ',auto' in rows[3] else rows[3].replace(',manual', ',auto', 1)
+    path.write_text(header + ''.join(rows) + rows[-1])
+    calls = []
+    stats = incremental_period_stats(path, state_dir, load_rows=_loader(path, calls))
+
+    assert len(calls) == 1
+    pd.testing.assert_frame_equal(stats, _full_stats(path), check_exact=True)
+    pd.testing.assert_frame_equal(incremental_period_stats(path, state_dir), stats, check_exact=True)
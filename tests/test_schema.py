@@ -0,0 +1,33 @@
+import pandas as pd
+from schema import SCHEMAS, read_csv_with_schema
+
+
+def test_non_date_values_become_nat(tmp_path):
+    path = tmp_path / 'deployments.csv'
+    path.write_text(
+        'pipeline_id,branch_name,branch_creation_datetime,deploy_prod_job_end_datetime,'
+        'days_elapsed_branch_to_deploy,deploy_prod_job_trigger\n'
+        '1,feat-1,2024-01-02T03:04:05.000Z,2024-01-03T03:04:05.000Z,1.0,auto\n'
+        '2,feat-2,2024-01-04T03:04:05.000Z,pending,,manual\n'
+        '3,feat-3,2024-01-05T03:04:05.000Z,,,auto\n')
+
+    df, fallbacks = read_csv_with_schema(path, SCHEMAS['deploy_prod_pipelines_2022_2025_argocd_refined.csv'])
+
+    ended = df['deploy_prod_job_end_datetime']
+    assert ended[0] == pd.Timestamp('2024-01-03T03:04:05Z')
+    assert ended[1:].isna().all()
+    assert fallbacks == {'branch_creation_datetime': 0, 'deploy_prod_job_end_datetime': 1}
+
+
+def test_column_without_any_date(tmp_path):
+    path = tmp_path / 'deployments.csv'
+    path.write_text(
+        'pipeline_id,branch_name,branch_creation_datetime,deploy_prod_job_end_datetime,'
+        'days_elapsed_branch_to_deploy,deploy_prod_job_trigger\n'
+        '1,feat-1,2024-01-02T03:04:05.000Z,pending,,auto\n'
+        '2,feat-2,2024-01-04T03:04:05.000Z,unknown,,manual\n')
+
+    df, fallbacks = read_csv_with_schema(path, SCHEMAS['deploy_prod_pipelines_2022_2025_argocd_refined.csv'])
+
+    assert df['deploy_prod_job_end_datetime'].isna().all()
+    assert fallbacks['deploy_prod_job_end_datetime'] == 2
@@ -0,0 +1,58 @@
+import numpy as np
+import pandas as pd
+
+
+class TimeAxis:
+    """Sorted, gap-free period axis that every dashboard series is aligned onto.
+
+    The axis covers every period from the first to the last one given, so a
+    period without data is an explicit gap on the axis rather than a missing
+    label. Positions are looked up through the PeriodIndex hash table: aligning
+    a series is one vectorized get_indexer() call instead of a list search per
+    period, which keeps alignment linear at daily or hourly granularity.
+    """
+
+    def __init__(self, periods, freq='M'):
+        periods = pd.PeriodIndex(periods, freq=freq).dropna()
+        if len(periods):
+            self.index = pd.period_range(periods.min(), periods.max(), freq=freq)
+        else:
+            self.index = pd.PeriodIndex([], freq=freq)
+        self.freq = freq
+        if self.index.freqstr.startswith('W'):
+            # Weeks are labelled by their first day rather than '2024-01-01/2024-01-07'
+            self.labels = self.index.start_time.strftime('%Y-%m-%d').tolist()
+        else:
+            self.labels = self.index.astype(str).tolist()
+
+    def __len__(self):
+        return len(self.index)
+
+    def positions(self, periods):
+        """Axis position of each period (-1 for periods outside the axis)"""
+        return self.index.get_indexer(pd.PeriodIndex(periods, freq=self.freq))
+
+    def position(self, period):
+        """Axis position of one period (or of the period containing a timestamp), None when it is outside the axis"""
+        position = int(self.positions([period])[0])
+        return position if position >= 0 else None
+
+    def _place(self, positions, values, fill):
+        values = values.tolist() if hasattr(values, 'tolist') else list(values)
+        aligned = np.full(len(self), fill, dtype=object)
+        on_axis = positions >= 0
+        aligned[positions[on_axis]] = np.array(values, dtype=object)[on_axis]
+        return aligned.tolist()
+
+    def reindex(self, periods, values, fill=None):
+        """``values`` (one per period) placed on the axis as a list; periods without a value get ``fill``.
+
+        Values keep their Python types (ints stay ints), and values of periods
+        outside the axis are dropped.
+        """
+        return self._place(self.positions(periods), values, fill)
+
+    def reindex_frame(self, periods, frame, fill=None):
+        """reindex() of every column of ``frame`` (rows aligned with ``periods``) with one position lookup"""
+        positions = self.positions(periods)
+        return {column: self._place(positions, frame[column], fill) for column in frame.columns}